@@ -9,12 +9,13 @@ setup(
     packages=[
         "ttoolly",
     ],
+    package_data={"ttoolly": ["data/words.txt"]},
     entry_points={
         "console_scripts": [
             "tt_get_field_template = ttoolly.commands.get_field_template:main",
             "tt_generate_cases = ttoolly.commands.generate_cases:main",
         ],
     },
-    install_requires=["Faker>=19.6.1", "rstr>=3.2.2"],
-    extras_require={"images": ["Pillow>=10.4"]},
+    install_requires=["Faker>=19.6.1"],
+    extras_require={"images": ["Pillow>=10.4"], "numpy": ["numpy>=1.22"]},
 )
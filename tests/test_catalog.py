@@ -0,0 +1,71 @@
+import json
+
+import pytest
+from ttoolly.catalog import FormCatalog
+from ttoolly.elements.common import Form
+
+
+@pytest.fixture
+def catalog_path(tmp_path):
+    created_at = {"type": "datetime", "required": True}
+    configs = {
+        "users.json": {
+            "fields": {
+                "created_at": created_at,
+                "email": {"type": "str", "str_format": "email", "required": True},
+            }
+        },
+        "orders.json": {
+            "fields": {
+                "created_at": created_at,
+                "count": {"type": "int", "min_value": 0, "max_value": 10},
+            }
+        },
+        "admin/products.json": {
+            "fields": {
+                "created_at": created_at,
+                "count": {"type": "int", "min_value": 0, "max_value": 20},
+            }
+        },
+        "readme.txt": "not a config",
+    }
+    for name, data in configs.items():
+        path = tmp_path / name
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(json.dumps(data))
+    return tmp_path
+
+
+def test_catalog_forms(catalog_path):
+    catalog = FormCatalog(catalog_path)
+    assert len(catalog) == 3
+    assert set(catalog) == {"users", "orders", "admin/products"}
+    assert "users" in catalog
+    assert catalog.get("other") is None
+    assert catalog["users"].get_all_fields() == {"created_at", "email"}
+    assert catalog["orders"].get_all_fields() == {"created_at", "count"}
+
+
+def test_catalog_shared_fields(catalog_path):
+    catalog = FormCatalog(catalog_path)
+    assert catalog["users"]["created_at"] is catalog["orders"]["created_at"]
+    assert catalog["orders"]["count"] is not catalog["admin/products"]["count"]
+    assert catalog["admin/products"]["count"].max_value == 20
+    assert catalog.get_fields_count() == 4
+
+
+def test_catalog_shared_field_is_frozen(catalog_path):
+    catalog = FormCatalog(catalog_path)
+    field = catalog["users"]["email"]
+    with pytest.raises(AttributeError):
+        field.max_length = 10
+    assert field.max_length == 254
+
+
+def test_forms_meta_are_independent():
+    form_1 = Form(fields={"f1": {"type": "str"}}, max_count=3)
+    form_2 = Form(fields={"f2": {"type": "str"}})
+    assert form_1.get_all_fields() == {"f1"}
+    assert form_2.get_all_fields() == {"f2"}
+    assert form_1.Meta.max_count == 3
+    assert form_2.Meta.max_count == 1
@@ -5,9 +5,11 @@ from decimal import Decimal, InvalidOperation
 
 import pytest
 from ttoolly.elements import common
+from ttoolly.utils import randomizer
 
 from .assertions import assert_instance_fields
 import re
+from unittest import mock
 from uuid import UUID
 
 COMMON_CASES_POSITIVE = [
@@ -305,9 +307,20 @@ def test_smallint_check_format_with_error(field_kwargs, exc):
             },
             1,
             Decimal("0.1"),
-            Decimal(sys.float_info.max - 1),
+            Decimal(sys.float_info.max) - 1,
             Decimal(sys.float_info.max),
         ),
+        (
+            {
+                "min_value": Decimal("-0.51"),
+                "max_value": Decimal("0.49"),
+                "step": Decimal("0.1"),
+            },
+            2,
+            Decimal("0.1"),
+            Decimal("-0.51"),
+            Decimal("0.49"),
+        ),
     ],
 )
 def test_decimal_get_random_value(
@@ -717,6 +730,50 @@ def test_time_get_random_value(field_kwargs, expected_min, expected_max):
     assert expected_min <= value <= expected_max
 
 
+@pytest.mark.parametrize(
+    "field_class, field_kwargs, check",
+    [
+        (
+            common.FieldDateTime,
+            {
+                "min_value": datetime(2024, 1, 1, 0, 5),
+                "max_value": datetime(2024, 1, 2, 0, 5),
+                "step": timedelta(minutes=15),
+            },
+            lambda value: value.minute % 15 == 5 and value.second == 0,
+        ),
+        (
+            common.FieldDateTime,
+            {"max_value": datetime(2024, 1, 1, 0, 0, 7), "step": timedelta(seconds=10)},
+            lambda value: value.second % 10 == 7 and value.microsecond == 0,
+        ),
+        (
+            common.FieldTime,
+            {
+                "min_value": time(1, 0, 3),
+                "max_value": time(2, 0, 3),
+                "step": timedelta(seconds=2),
+            },
+            lambda value: value.second % 2 == 1 and value.microsecond == 0,
+        ),
+        (
+            common.FieldDate,
+            {"min_value": date(2024, 1, 1), "step": timedelta(days=7)},
+            lambda value: value.weekday() == date(2024, 1, 1).weekday(),
+        ),
+    ],
+)
+def test_temporal_get_random_value_step(field_class, field_kwargs, check):
+    field = field_class(**field_kwargs)
+    with mock.patch.object(
+        field_class, "_compute_integer_range", wraps=field._compute_integer_range
+    ) as compute:
+        values = [field.get_random_value() for _ in range(100)]
+        values += field.get_random_values(100)
+    assert compute.call_count == 1
+    assert all(check(value) for value in values)
+
+
 @pytest.mark.parametrize(
     "field_kwargs, expected",
     [
@@ -815,6 +872,50 @@ def test_str_get_random_value(field_kwargs, expected_re):
     assert re.match(expected_re, value)
 
 
+@pytest.mark.parametrize("str_format", ["email", "email_simple"])
+def test_str_get_random_values_email(str_format):
+    field = common.FieldStr(str_format=str_format, max_length=40)
+    values = field.get_random_values(50)
+    assert len(values) == 50
+    assert all(3 <= len(value) <= 40 and "@" in value for value in values)
+    if str_format == "email_simple":
+        assert all(re.match(r"^[a-z0-9]+@[a-z0-9.-]+$", value) for value in values)
+
+
+def test_str_get_random_value_regex_group_reference():
+    field = common.FieldStr(str_format={"re": r"(\d)-\1"}, max_length=10)
+    assert re.fullmatch(r"(\d)-\1", field.get_random_value())
+
+
+@pytest.mark.parametrize(
+    "field_kwargs,length,expected_lengths",
+    [
+        ({"min_length": 3, "max_length": 6}, None, range(3, 7)),
+        ({"max_length": 2}, None, range(1, 3)),
+        ({"min_length": 150}, None, range(150, 251)),
+        ({}, 300, [300]),
+    ],
+)
+def test_str_get_random_value_regex_length(field_kwargs, length, expected_lengths):
+    field = common.FieldStr(str_format={"re": r"[a-z]+\d*"}, **field_kwargs)
+    for _ in range(20):
+        value = field.get_random_value(length)
+        assert re.fullmatch(r"[a-z]+\d*", value)
+        assert len(value) in expected_lengths
+
+
+@pytest.mark.parametrize("min_length,max_length", [(1, 1), (5, 20), (100, 1000)])
+def test_str_get_random_value_text(min_length, max_length):
+    field = common.FieldStr(
+        str_format="text", min_length=min_length, max_length=max_length
+    )
+    for _ in range(20):
+        value = field.get_random_value()
+        assert min_length <= len(value) <= max_length
+        assert value == value.strip()
+        assert re.match(r"^[A-Z][a-z]*", value)
+
+
 @pytest.mark.parametrize(
     "field_kwargs, expected",
     [
@@ -874,6 +975,7 @@ def test_str_check_format(field_kwargs, expected):
         ({"str_format": {"re": ""}}, ValueError),
         ({"str_format": {"re": 123}}, TypeError),
         ({"str_format": {"re": "**"}}, re.error),
+        ({"str_format": {"re": r"(?<=a+)b"}}, re.error),
         ({"null_allowed": "qwe"}, ValueError),
     ]
     + COMMON_CASES_NEGATIVE,
@@ -1093,6 +1195,42 @@ def test_file_check_format_with_error(field_kwargs, exc):
         common.FieldFile(**field_kwargs)
 
 
+@pytest.mark.parametrize(
+    "field_kwargs, expected_re",
+    [
+        ({}, r"^\w+\.txt$"),
+        ({"extensions": ["csv", "pdf"], "max_length": 6}, r"^\w{1,2}\.(csv|pdf)$"),
+        ({"min_length": 20}, r"^\w{16,}\.txt$"),
+    ],
+)
+def test_file_get_random_value(field_kwargs, expected_re):
+    with randomizer.use_size_profile("uniform"):
+        value = common.FieldFile(max_size=100, **field_kwargs).get_random_value()
+    assert isinstance(value, randomizer.SpooledFile)
+    assert re.match(expected_re, value.name)
+    assert 1 <= len(value.read()) <= 100
+
+
+def test_file_get_random_value_count_and_sizes():
+    field = common.FieldFile(max_count=3, max_size=2000, sum_max_size=3000)
+    with randomizer.use_size_profile("boundary"):
+        for _ in range(20):
+            value = field.get_random_value()
+            assert 1 <= len(value) <= 3
+            sizes = [len(f.read()) for f in value]
+            assert all(1 <= size <= 2000 for size in sizes)
+            assert sum(sizes) <= 3000
+
+
+def test_file_get_random_value_spooled():
+    field = common.FieldFile(max_size=3 * randomizer.SPOOL_MAX_SIZE)
+    with randomizer.use_size_profile("minimal"):
+        assert not field.get_random_value()._rolled
+    with randomizer.use_size_profile("boundary"):
+        values = [field.get_random_value() for _ in range(10)]
+    assert any(value._rolled for value in values)
+
+
 @pytest.mark.parametrize(
     "field_kwargs, expected",
     [
@@ -1192,6 +1330,50 @@ def test_image_check_format_with_error(field_kwargs, exc):
         common.FieldImage(**field_kwargs)
 
 
+@pytest.mark.parametrize(
+    "extension,signature",
+    [
+        ("png", b"\x89PNG"),
+        ("bmp", b"BM"),
+        ("gif", b"GIF8"),
+        ("jpg", b"\xff\xd8\xff"),
+        ("svg", b"<?xml"),
+    ],
+)
+def test_image_get_random_value(extension, signature):
+    if extension == "jpg":
+        pytest.importorskip("PIL")
+    field = common.FieldImage(extensions=[extension], max_size=50000)
+    with randomizer.use_size_profile("uniform"):
+        value = field.get_random_value()
+    assert value.name.endswith(f".{extension}")
+    content = value.read()
+    assert content.startswith(signature)
+    assert len(content) <= 50000
+
+
+def test_image_bmp_fits_size():
+    field = common.FieldImage(
+        extensions=["bmp"], max_width=1, min_height=900, max_height=1000
+    )
+    for _ in range(100):
+        f = field._make_files([("a.bmp", "bmp", 4000)])[0]
+        assert 3600 < f.size <= 4000
+
+
+@pytest.mark.parametrize("extension", ["bmp", "png", "gif", "jpg", "webp", "tiff"])
+@pytest.mark.parametrize("profile", ["boundary", "uniform"])
+def test_image_get_random_value_fits_max_size(extension, profile):
+    if extension in ("jpg", "webp", "tiff"):
+        pytest.importorskip("PIL")
+    field = common.FieldImage(
+        extensions=[extension], max_size=4000, sum_max_size=4000, max_width=1
+    )
+    with randomizer.use_size_profile(profile):
+        sizes = [field.get_random_value().size for _ in range(100)]
+    assert max(sizes) <= 4000
+
+
 @pytest.mark.parametrize(
     "field_kwargs, expected",
     [
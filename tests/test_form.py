@@ -0,0 +1,410 @@
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+import pytest
+from ttoolly.elements import common
+from ttoolly.elements.common import Form
+from ttoolly.elements.rest import Form as RestForm
+from ttoolly.uniqueness import UniqueIndex
+from ttoolly.utils import randomizer
+
+
+def test_trusted_form_without_validation():
+    with mock.patch.object(common.FieldDecimal, "validate") as validate:
+        form = Form(
+            fields={"f1": {"type": "decimal", "max_value": 10, "min_value": 0}},
+            trusted=True,
+        )
+    validate.assert_not_called()
+    assert form["f1"].max_value == 10
+
+
+def test_trusted_form_sample_validation():
+    with pytest.raises(AssertionError) as exc_info:
+        Form(
+            fields={"f1": {"type": "int", "max_value": 0, "min_value": 10}},
+            trusted=True,
+            trusted_sample_rate=1,
+        )
+    assert str(exc_info.value).startswith(
+        'Trusted definition of field "f1" is not valid'
+    )
+
+
+def test_validated_definition_is_not_validated_again():
+    fields = {"f1": {"type": "int", "max_value": 10, "min_value": 3, "step": 7}}
+    Form(fields=fields)
+    with mock.patch.object(common.FieldInt, "validate") as validate:
+        form = Form(fields=fields)
+    validate.assert_not_called()
+    assert form["f1"].step == 7
+
+
+def test_validated_definitions_are_bounded():
+    definitions = common.ValidatedDefinitions(maxsize=2)
+    for key in ("a", "b", "c"):
+        definitions.add(key)
+    assert len(definitions) == 2
+    assert "a" not in definitions
+    assert "b" in definitions
+    definitions.add("d")
+    assert "b" in definitions and "c" not in definitions
+
+
+def test_lazy_form_creates_field_on_access():
+    fields = {f"f{i}": {"type": "int", "required": i < 2} for i in range(1000)}
+    fields["f0"]["min_value"] = 5
+    form = Form(fields=fields, lazy=True)
+    assert len(form.get_all_fields()) == 1000
+    assert "f0" not in form.__dict__
+    assert form["f0"].min_value == 5
+    assert isinstance(form.f0, common.FieldInt)
+    assert "f0" in form.__dict__
+    assert "f1" not in form.__dict__
+
+
+def test_lazy_form_planning_without_fields():
+    form = Form(
+        fields={
+            "f1": {"type": "str", "required": True},
+            "f2": {"type": "str", "only": {"if": {"f1": None}}},
+            "f3": {"type": "str", "required": {"if": "f1"}},
+        },
+        lazy=True,
+    )
+    assert sorted(form.get_required_fields()) == ["f1", "f3"]
+    assert form.get_one_of_fields() == {"f1": [], "f2": [["f1"]], "f3": []}
+    assert form.get_condition("f3", "required").filled == "f1"
+    assert not {"f1", "f2", "f3"}.intersection(form.__dict__)
+
+
+def test_lazy_form_unknown_attribute():
+    form = Form(fields={"f1": {"type": "str"}}, lazy=True)
+    with pytest.raises(AttributeError):
+        form["f2"]
+
+
+def test_get_random_data_batch():
+    form = Form(
+        fields={
+            "f1": {"type": "int", "min_value": 3, "max_value": 30, "step": 3},
+            "f2": {"type": "decimal", "min_value": 0, "max_value": 1, "step": "0.25"},
+            "f3": {"type": "bool"},
+            "f4": {"type": "select", "choice_values": ["a", "b"]},
+            "f5": {"type": "str", "max_length": 5},
+            "f6": {"type": "int"},
+        }
+    )
+    batch = form.get_random_data_batch(
+        100, ["f1", "f2", "f3", "f4", "f5", "f6"], additional={"f7": 1}
+    )
+    assert len(batch) == 100
+    assert len(batch.columns["f1"]) == 100
+    assert set(batch.columns["f1"]).issubset(range(3, 31, 3))
+    assert set(batch.columns["f2"]).issubset(
+        {Decimal("0"), Decimal("0.25"), Decimal("0.5"), Decimal("0.75"), Decimal("1")}
+    )
+    assert set(batch.columns["f3"]).issubset({True, False})
+    assert set(batch.columns["f4"]).issubset({"a", "b"})
+    assert all(1 <= len(v) <= 5 for v in batch.columns["f5"])
+    assert all(isinstance(v, int) for v in batch.columns["f6"])
+    assert batch.columns["f7"] == [1] * 100
+    row = batch[-1]
+    assert row == {k: v[99] for k, v in batch.columns.items()}
+    assert list(batch)[0] == batch[0]
+    assert len(batch[10:20]) == 10
+    with pytest.raises(IndexError):
+        batch[100]
+
+
+def test_get_random_data_batch_required_fields():
+    form = Form(
+        fields={
+            "f1": {"type": "date", "required": True},
+            "f2": {"type": "date"},
+        }
+    )
+    batch = form.get_random_data_batch(3)
+    assert list(batch.columns.keys()) == ["f1"]
+    assert all(isinstance(v, date) for v in batch.columns["f1"])
+
+
+def test_rest_get_random_data_batch():
+    form = RestForm(fields={"f1": {"type": "date"}})
+    batch = form.get_random_data_batch(3, ["f1"])
+    assert all(isinstance(v, str) for v in batch.columns["f1"])
+    date.fromisoformat(batch[0]["f1"])
+
+
+SEEDED_FIELDS = {
+    "f1": {"type": "int"},
+    "f2": {"type": "decimal", "min_value": 0, "max_value": 100},
+    "f3": {"type": "date"},
+    "f4": {"type": "datetime"},
+    "f5": {"type": "time"},
+    "f6": {"type": "str", "max_length": 50},
+    "f7": {"type": "str", "str_format": "email"},
+    "f8": {"type": "str", "str_format": {"re": r"[A-Z]{3}-\d{4}"}},
+    "f9": {"type": "uuid"},
+    "f10": {"type": "bool"},
+}
+
+
+def test_seeded_form_reproducible():
+    form_1 = Form(fields=deepcopy(SEEDED_FIELDS), seed=42)
+    form_2 = Form(fields=deepcopy(SEEDED_FIELDS), seed=42)
+    fields = list(SEEDED_FIELDS.keys())
+    data = [form_1.get_random_data(fields) for _ in range(3)]
+    assert data == [form_2.get_random_data(fields) for _ in range(3)]
+    assert data[0] != data[1]
+    assert form_1.get_random_data(fields, case=1) == data[1]
+    assert Form(fields=deepcopy(SEEDED_FIELDS), seed=43).get_random_data(
+        fields, case=0
+    ) != form_1.get_random_data(fields, case=0)
+
+
+def test_seeded_form_field_independent_of_other_fields():
+    form = Form(fields=deepcopy(SEEDED_FIELDS), seed="seed")
+    data = form.get_random_data(["f1", "f6", "f8"], case=5)
+    assert form.get_random_data(["f8"], case=5) == {"f8": data["f8"]}
+    assert form.get_random_data(["f6", "f1"], case=5) == {
+        "f1": data["f1"],
+        "f6": data["f6"],
+    }
+
+
+def test_seeded_form_parallel_generation():
+    form = Form(fields=deepcopy(SEEDED_FIELDS), seed=1)
+    fields = list(SEEDED_FIELDS.keys())
+    serial = [form.get_random_data(fields, case=i) for i in range(20)]
+    with ThreadPoolExecutor(4) as executor:
+        parallel = list(
+            executor.map(lambda i: form.get_random_data(fields, case=i), range(20))
+        )
+    assert parallel == serial
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_seeded_form_batch_reproducible(backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    fields = list(SEEDED_FIELDS.keys())
+    batch_1 = Form(fields=deepcopy(SEEDED_FIELDS), seed=7).get_random_data_batch(
+        10, fields, backend=backend, case=3
+    )
+    batch_2 = Form(fields=deepcopy(SEEDED_FIELDS), seed=7).get_random_data_batch(
+        10, fields, backend=backend, case=3
+    )
+    assert batch_1.columns == batch_2.columns
+
+
+def test_form_size_profile():
+    form = Form(fields={"f1": {"type": "str"}}, size_profile="boundary")
+    lengths = {len(form.get_random_data(["f1"])["f1"]) for _ in range(50)}
+    assert lengths.issubset({1, 2, 99999, 100000})
+    batch = form.get_random_data_batch(50, ["f1"])
+    assert {len(value) for value in batch.columns["f1"]}.issubset(
+        {1, 2, 99999, 100000}
+    )
+    with randomizer.use_size_profile("realistic"):
+        data = Form(fields={"f1": {"type": "str"}}).get_random_data(["f1"])
+    assert len(data["f1"]) <= 255
+
+
+def test_form_unique_values():
+    form = Form(
+        fields={
+            "f1": {"type": "int", "min_value": 1, "max_value": 5, "unique": True},
+            "f2": {"type": "int", "min_value": 1, "max_value": 5},
+        }
+    )
+    values = [form.get_random_data(["f1", "f2"])["f1"] for _ in range(5)]
+    assert sorted(values) == list(range(1, 6))
+    with pytest.warns(UserWarning, match='unique value of field "f1"'):
+        assert form.get_random_data(["f1"])["f1"] in range(1, 6)
+    assert form.get_random_data(["f1"], additional={"f1": 1}) == {"f1": 1}
+    form.clear_unique_values()
+    assert form.get_random_data(["f1"])["f1"] in range(1, 6)
+
+
+def test_form_unique_values_batch():
+    form = Form(
+        fields={"f1": {"type": "int", "min_value": 1, "max_value": 8, "unique": True}},
+        seed=1,
+    )
+    batch = form.get_random_data_batch(5, ["f1"])
+    values = batch.columns["f1"] + [form.get_random_data(["f1"])["f1"] for _ in range(3)]
+    assert sorted(values) == list(range(1, 9))
+
+
+def test_form_unique_values_case_insensitive():
+    form = Form(
+        fields={
+            "f1": {
+                "type": "select",
+                "choice_values": ["a", "A", "b", "B"],
+                "unique": {"case_sensitive": False},
+            }
+        }
+    )
+    values = {form.get_random_data(["f1"])["f1"].lower() for _ in range(2)}
+    assert values == {"a", "b"}
+    with pytest.warns(UserWarning):
+        form.get_random_data(["f1"])
+
+
+def test_form_unique_values_with_fields():
+    form = Form(
+        fields={
+            "f1": {"type": "bool", "unique": {"with": ["f2"]}},
+            "f2": {"type": "int", "min_value": 1, "max_value": 3},
+        }
+    )
+    pairs = [
+        tuple(form.get_random_data(["f1", "f2"], additional={"f2": i}).values())
+        for i in (1, 2, 3)
+        for _ in range(2)
+    ]
+    assert sorted(pairs) == [(f1, f2) for f1 in (False, True) for f2 in (1, 2, 3)]
+
+
+def test_form_unique_scope():
+    form = Form(fields={"f1": {"type": "bool", "unique": True}})
+    for _ in range(3):
+        with form.unique_scope():
+            values = {form.get_random_data(["f1"])["f1"] for _ in range(2)}
+            assert values == {False, True}
+            with pytest.warns(UserWarning):
+                form.get_random_data(["f1"])
+    assert form.get_random_data(["f1"])["f1"] in (False, True)
+
+
+def test_unique_index_add_is_atomic():
+    index = UniqueIndex()
+    with ThreadPoolExecutor(8) as executor:
+        added = list(executor.map(index.add, [i % 1000 for i in range(40000)]))
+    assert sum(added) == len(index) == 1000
+    index.clear()
+    assert len(index) == 0 and 1 not in index
+
+
+def test_unique_index_bloom_filter():
+    index = UniqueIndex(exact_limit=10, capacity=1000, error_rate=0.001)
+    assert all(index.add(i) for i in range(500))
+    assert not any(index.add(i) for i in range(500))
+    assert len(index) == 500
+    false_positives = sum(i in index for i in range(500, 10500))
+    assert false_positives < 100
+
+
+def test_form_lt_lte_relations_chain():
+    fields = {
+        f"f{i}": {
+            "type": "int",
+            "min_value": 0,
+            "max_value": 20,
+            "lt": [f"f{i + 1}"],
+        }
+        for i in range(20)
+    }
+    fields["f20"] = {"type": "int", "min_value": 0, "max_value": 20}
+    form = Form(fields=fields)
+    for _ in range(20):
+        data = form.get_random_data(list(fields))
+        assert [data[f"f{i}"] for i in range(21)] == list(range(21))
+
+
+@pytest.mark.parametrize("backend", ["python", "numpy"])
+def test_form_lt_lte_relations(backend):
+    if backend == "numpy":
+        pytest.importorskip("numpy")
+    form = Form(
+        fields={
+            "start": {"type": "date", "lte": ["end"], "min_value": date(2024, 1, 1)},
+            "end": {
+                "type": "date",
+                "lt": ["deadline"],
+                "min_value": date(2024, 1, 1),
+                "max_value": date(2024, 1, 10),
+            },
+            "deadline": {"type": "date", "max_value": date(2024, 1, 5)},
+            "price": {"type": "decimal", "step": "0.5", "lt": ["limit"], "min_value": 0},
+            "limit": {"type": "int", "min_value": 0, "max_value": 3},
+        }
+    )
+    fields = ["start", "end", "deadline", "price", "limit"]
+    batch = form.get_random_data_batch(50, fields, backend=backend)
+    for data in list(batch) + [form.get_random_data(fields) for _ in range(50)]:
+        assert data["start"] <= data["end"] < data["deadline"] <= date(2024, 1, 5)
+        assert 0 <= data["price"] < data["limit"]
+        assert data["price"] % Decimal("0.5") == 0
+    data = form.get_random_data(["start", "end"], additional={"deadline": date(2024, 1, 2)})
+    assert data["start"] == data["end"] == date(2024, 1, 1)
+    with pytest.raises(ValueError, match='field "end" satisfying lt/lte'):
+        form.get_random_data(["end"], additional={"deadline": date(2024, 1, 1)})
+
+
+def test_form_lt_lte_relations_seeded():
+    fields = {
+        "f1": {"type": "int", "min_value": 0, "max_value": 100, "lt": ["f2"]},
+        "f2": {"type": "int", "min_value": 0, "max_value": 100},
+    }
+    data = [
+        Form(fields=deepcopy(fields), seed=5).get_random_data(["f1", "f2"], case=1)
+        for _ in range(2)
+    ]
+    assert data[0] == data[1]
+    assert data[0]["f1"] < data[0]["f2"]
+
+
+def test_form_lt_lte_relations_cyclic():
+    form = Form(
+        fields={
+            "f1": {"type": "int", "lt": ["f2"]},
+            "f2": {"type": "int", "lte": ["f1"]},
+        }
+    )
+    with pytest.raises(ValueError, match="cyclic"):
+        form.get_random_data(["f1", "f2"])
+
+
+@pytest.mark.parametrize(
+    "condition,payload,expected",
+    [
+        (True, {}, True),
+        ({"if": "f2"}, {"f2": "a"}, True),
+        ({"if": "f2"}, {"f2": ""}, False),
+        ({"if": "f2"}, {}, False),
+        ({"if": {"f2": None}}, {}, True),
+        ({"if": {"f2": None}}, {"f2": 1}, False),
+        ({"if": {"f2": 1, "f3": None}}, {"f2": 1}, True),
+        ({"if": {"f2": 1, "f3": None}}, {"f2": 1, "f3": 2}, False),
+        ({"if": [{"f2": 1}, {"f3": 2}]}, {"f3": 2}, True),
+        ({"if": [{"f2": 1}, {"f3": 2}]}, {"f2": 2, "f3": 1}, False),
+    ],
+)
+def test_condition_compile(condition, payload, expected):
+    assert common.Condition(condition).compile()(payload) is expected
+
+
+def test_form_get_payload_errors():
+    form = Form(
+        fields={
+            "f1": {"type": "int", "required": True},
+            "f2": {"type": "int", "required": {"if": {"f1": 1}}},
+            "f3": {"type": "int", "only": {"if": {"f2": None}}},
+            "f4": {"type": "str", "not_empty": True},
+        }
+    )
+    assert form.get_payload_errors({"f1": 2, "f4": "a"}) == {}
+    assert form.get_payload_errors({"f1": 1, "f3": 1, "f4": ""}) == {
+        "f2": "required",
+        "f4": "not_empty",
+    }
+    assert form.get_payload_errors({"f2": 1, "f3": 1}) == {"f1": "required", "f3": "only"}
+    form["f5"] = common.FieldInt(name="f5", required=True)
+    assert form.get_payload_errors({"f1": 2}) == {"f5": "required"}
+    assert sorted(form.get_required_fields()) == ["f1", "f2", "f5"]
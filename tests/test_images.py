@@ -0,0 +1,143 @@
+from random import Random
+from unittest import mock
+
+import pytest
+from ttoolly.utils import randomizer
+from ttoolly.utils import images
+from ttoolly.utils.images import ImageCache, get_random_images, split_size
+
+
+def test_image_cache_generates_once():
+    cache = ImageCache()
+    with mock.patch.object(
+        randomizer, "get_random_img_content", wraps=randomizer.get_random_img_content
+    ) as get_content:
+        first = cache.get("PNG", 1000, 10, 20, seed=1)
+        second = cache.get("png", 1000, 10, 20, seed=1)
+        other = cache.get("PNG", 1000, 10, 20, seed=2)
+    assert get_content.call_count == 2
+    assert first.readonly
+    assert bytes(first) == bytes(second)
+    assert bytes(first) != bytes(other)
+    assert bytes(first).startswith(b"\x89PNG")
+    assert len(first) == 1000
+
+
+def test_image_cache_content_is_reproducible():
+    assert bytes(ImageCache().get("SVG", 0, 10, 10, seed=3)) == bytes(
+        ImageCache().get("SVG", 0, 10, 10, seed=3)
+    )
+
+
+def test_image_cache_lru_eviction():
+    cache = ImageCache(max_memory=2500)
+    for seed in range(3):
+        cache.get("BMP", 1000, 1, 1, seed=seed)
+    assert len(cache) == 2
+    cache.get("BMP", 1000, 1, 1, seed=1)
+    cache.get("BMP", 1000, 1, 1, seed=3)
+    assert len(cache) == 2
+    with mock.patch.object(randomizer, "get_random_img_content") as get_content:
+        cache.get("BMP", 1000, 1, 1, seed=1)
+    get_content.assert_not_called()
+
+
+def test_image_cache_on_disk(tmp_path):
+    content = bytes(ImageCache(path=str(tmp_path)).get("GIF", 500, 5, 5, seed=1))
+    assert len(list(tmp_path.iterdir())) == 1
+    with mock.patch.object(randomizer, "get_random_img_content") as get_content:
+        cached = ImageCache(path=str(tmp_path)).get("GIF", 500, 5, 5, seed=1)
+    get_content.assert_not_called()
+    assert cached.readonly
+    assert bytes(cached) == content
+
+
+def test_image_cache_on_disk_is_kept_in_memory(tmp_path):
+    ImageCache(path=str(tmp_path)).get("GIF", 500, 5, 5, seed=1)
+    cache = ImageCache(path=str(tmp_path))
+    first = cache.get("GIF", 500, 5, 5, seed=1)
+    with mock.patch("builtins.open") as _open:
+        second = cache.get("GIF", 500, 5, 5, seed=1)
+    _open.assert_not_called()
+    assert bytes(first) == bytes(second)
+    assert len(cache) == 1
+
+
+def test_get_random_image_with_seed():
+    first = randomizer.get_random_image(filename="a.png", size="2K", width=5, height=5, seed=1)
+    second = randomizer.get_random_image(filename="a.png", size="2K", width=5, height=5, seed=1)
+    assert first.read() == second.read()
+
+
+@pytest.mark.parametrize(
+    "size,count,expected",
+    ((10, 1, [10]), (10, 3, [4, 3, 3]), (9, 3, [3, 3, 3]), (2, 3, [1, 1, 0])),
+)
+def test_split_size(size, count, expected):
+    assert split_size(size, count) == expected
+
+
+def test_get_random_images():
+    result = get_random_images(4, "20K", extensions=("png", "gif"), width=5, height=5)
+    assert [f.size for f in result] == [5 * 1024] * 4
+    assert [f.name.rsplit(".", 1)[1] for f in result] == ["png", "gif", "png", "gif"]
+    assert result[0].read(4) == b"\x89PNG"
+    assert result[1].read(3) == b"GIF"
+
+
+def test_get_random_images_does_not_depend_on_pool():
+    pytest.importorskip("PIL")
+    with mock.patch.object(images.os, "cpu_count", return_value=2), mock.patch.object(
+        images, "PARALLEL_MIN_PIXELS", 1
+    ):
+        contents = []
+        for max_workers in (1, 2):
+            with randomizer.use_random(Random(1)), mock.patch.object(
+                images, "image_cache", ImageCache()
+            ):
+                contents.append(
+                    [
+                        f.read()
+                        for f in get_random_images(
+                            3,
+                            "300K",
+                            extensions=("webp", "png"),
+                            width=100,
+                            height=100,
+                            max_workers=max_workers,
+                        )
+                    ]
+                )
+    assert contents[0] == contents[1]
+    assert images._executors[2]._mp_context.get_start_method() != "fork"
+
+
+def test_get_padded_images_uses_cache():
+    specs = [("png", "2K", 5, 5, "a.png"), ("gif", "2K", 5, 5, "b.gif")]
+    with mock.patch.object(images, "image_cache", ImageCache()):
+        with randomizer.use_random(Random(1)):
+            first = [f.read() for f in images.get_padded_images(specs)]
+        with randomizer.use_random(Random(1)), mock.patch.object(
+            images, "encode_images", return_value=[]
+        ) as encode:
+            second = [f.read() for f in images.get_padded_images(specs)]
+    encode.assert_called_once_with([], None)
+    assert first == second
+    assert [len(content) for content in first] == [2048, 2048]
+
+
+@pytest.mark.parametrize(
+    "specs,parallel",
+    [
+        ([("WEBP", 1000, 1000, 1), ("WEBP", 1000, 1000, 2)], True),
+        ([("WEBP", 1000, 1000, 1), ("PNG", 1000, 1000, 2)], False),
+        ([("BMP", 1000, 1000, 1), ("BMP", 1000, 1000, 2)], False),
+        ([("WEBP", 100, 100, 1), ("WEBP", 100, 100, 2)], False),
+    ],
+)
+def test_encode_images_uses_pool(specs, parallel):
+    with mock.patch.object(images.os, "cpu_count", return_value=2), mock.patch.object(
+        images, "_get_executor"
+    ) as get_executor, mock.patch.object(images, "_encode_image", return_value=b""):
+        images.encode_images(specs)
+    assert get_executor.called is parallel
@@ -0,0 +1,44 @@
+import re
+import subprocess
+import sys
+
+import pytest
+
+HEAVY_MODULES = ("faker", "rstr", "dateutil", "PIL")
+
+
+def get_import_times(code):
+    """
+    Cumulative import time (us) of each module from python -X importtime
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return {
+        name: int(cumulative)
+        for cumulative, name in re.findall(
+            r"^import time:\s+\d+ \|\s+(\d+) \|\s+(\S+)", result.stderr, re.MULTILINE
+        )
+    }
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "ttoolly.elements.common",
+        "ttoolly.elements.rest",
+        "ttoolly.commands.get_field_template",
+        "ttoolly.commands.generate_cases",
+        "ttoolly.utils.randomizer",
+    ],
+)
+def test_import_without_heavy_dependencies(module):
+    import_times = get_import_times(f"import {module}")
+    heavy = [name for name in import_times if name.split(".")[0] in HEAVY_MODULES]
+    assert not heavy, (
+        f"{module} imports {', '.join(heavy)} "
+        f"({import_times[module] / 1000:.1f} ms in total)"
+    )
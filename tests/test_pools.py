@@ -0,0 +1,84 @@
+import itertools
+import threading
+import time
+
+import pytest
+from ttoolly.elements.common import Form
+from ttoolly.pools import ValuePool
+
+
+def test_pool_filled_in_background():
+    counter = itertools.count()
+    with ValuePool(lambda: next(counter), size=10) as pool:
+        assert pool.wait(5)
+        assert len(pool) == 10
+        assert pool.pop_many(3) == [0, 1, 2]
+        assert pool.wait(5)
+        assert len(pool) == 10
+
+
+def test_pool_generates_when_empty():
+    event = threading.Event()
+    counter = itertools.count()
+
+    def generate():
+        if threading.current_thread() is not threading.main_thread():
+            event.wait(5)
+        return next(counter)
+
+    with ValuePool(generate, size=5) as pool:
+        assert len(pool) == 0
+        assert isinstance(pool.pop(), int)
+        event.set()
+
+
+def test_pool_unique():
+    values = itertools.cycle("aAbB")
+    with ValuePool(
+        lambda: next(values), size=2, unique=True, key=lambda value: value.lower()
+    ) as pool:
+        assert sorted(pool.pop_many(2)) == ["a", "b"]
+        with pytest.raises(ValueError):
+            pool.pop()
+
+
+def test_pool_eviction():
+    counter = itertools.count()
+    with ValuePool(lambda: next(counter), size=3, max_age=0.05) as pool:
+        pool.wait(5)
+        first = list(pool._values)[0][1]
+        time.sleep(0.1)
+        assert pool.pop() != first
+
+
+def test_pool_wrong_size():
+    with pytest.raises(ValueError) as exc_info:
+        ValuePool(lambda: 1, size=0)
+    assert str(exc_info.value) == "Pool size (0) can not be less than 1"
+
+
+def test_form_use_pool():
+    form = Form(
+        fields={
+            "f1": {"type": "str", "str_format": "email"},
+            "f2": {"type": "int", "max_value": 10, "min_value": 0},
+        }
+    )
+    pool = form.use_pool("f1", size=20, unique=True)
+    pool.wait(5)
+    data = [form.get_random_data(["f1", "f2"]) for _ in range(10)]
+    assert len({el["f1"] for el in data}) == 10
+    batch = form.get_random_data_batch(15, ["f1"])
+    assert len(set(batch.columns["f1"]).union(el["f1"] for el in data)) == 25
+    form.close_pools()
+    assert pool._closed
+    assert "@" in form.get_random_data(["f1"])["f1"]
+
+
+def test_form_use_pool_with_size_profile():
+    form = Form(
+        fields={"f1": {"type": "str", "max_length": 100}}, size_profile="minimal"
+    )
+    with form.use_pool("f1", size=20) as pool:
+        pool.wait(5)
+        assert {len(value) for value in pool.pop_many(20)} == {1}
@@ -0,0 +1,139 @@
+import re
+from concurrent.futures import ThreadPoolExecutor
+from random import Random
+
+import pytest
+from ttoolly.utils import randomizer
+from ttoolly.utils.regex import RegexSampler, get_regex_sampler
+
+PATTERNS = [
+    r"\d{2}-\w{5}",
+    r"[A-Z]{3}-\d{4}",
+    r"^(foo|bar)+baz$",
+    r"[a-f0-9]{8}(-[a-f0-9]{4}){3}-[a-f0-9]{12}",
+    r"\+7 \(\d{3}\) \d{3}-\d{2}-\d{2}",
+    r"(?P<code>[A-Z]{2})\d*(?P=code)",
+    r"a.b\sc\Sd",
+    r"[^abc]{5}",
+    r"x[^\d]y",
+    r"[\w.-]+@[a-z]+\.(com|org)",
+    r"(?i)ab?c*?",
+    r"(?=\d)\d+",
+    r"(?!a)b",
+    r"[a-c\d_]{1,3}",
+]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_regex_sampler_matches(pattern):
+    sampler = get_regex_sampler(pattern)
+    for _ in range(50):
+        value = sampler.get_random_value()
+        assert re.fullmatch(pattern, value), value
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"\d{2}-\w{5}",
+        r"[A-Z]{3}-\d{4}",
+        r"^(foo|bar)+baz$",
+        r"\+7 \(\d{3}\) \d{3}-\d{2}-\d{2}",
+        r"a.b\sc\Sd",
+        r"[a-c\d_]{1,3}",
+    ],
+)
+def test_regex_sampler_same_as_rstr(pattern):
+    rstr = pytest.importorskip("rstr")
+    with randomizer.use_random(Random(5)):
+        values = [get_regex_sampler(pattern).get_random_value() for _ in range(20)]
+    rng = Random(5)
+    assert values == [rstr.Rstr(rng).xeger(pattern) for _ in range(20)]
+
+
+def test_regex_sampler_star_limit():
+    sampler = get_regex_sampler(r"a*")
+    assert max(len(sampler.get_random_value()) for _ in range(200)) <= 100
+
+
+def test_regex_sampler_cached():
+    assert get_regex_sampler(r"\d+") is get_regex_sampler(r"\d+")
+
+
+def test_regex_sampler_wrong_pattern():
+    with pytest.raises(re.error):
+        RegexSampler("**")
+
+
+@pytest.mark.parametrize(
+    "pattern,min_length,max_length",
+    [
+        (r"\d{2}-\w{5}", 0, 10),
+        (r"^(foo|bar)+baz$", 9, 15),
+        (r"[\w.-]+@[a-z]+\.(com|org)", 8, 12),
+        (r"[\w.-]+@[a-z]+\.(com|org)", 200, None),
+        (r"(?i)ab?c*?", 0, 3),
+        (r"(?=\d)\d+", 10, None),
+        (r"[^abc]{5}", 5, 5),
+        (r"[a-c\d_]{1,3}", 2, 3),
+        (r"(a?){0,5}b", 3, 4),
+    ],
+)
+def test_regex_sampler_bounded_length(pattern, min_length, max_length):
+    sampler = get_regex_sampler(pattern)
+    for _ in range(30):
+        value = sampler.get_random_value(min_length, max_length)
+        assert re.fullmatch(pattern, value), value
+        assert min_length <= len(value) <= (max_length or min_length + 100)
+
+
+def test_regex_sampler_bounded_length_is_not_limited_by_star():
+    value = get_regex_sampler(r"\w+@\d*").get_random_value(500, 500)
+    assert len(value) == 500
+    assert re.fullmatch(r"\w+@\d*", value)
+
+
+def test_regex_sampler_bounded_length_uses_all_lengths():
+    sampler = get_regex_sampler(r"(ab|c){2,}")
+    with randomizer.use_size_profile("uniform"):
+        lengths = {len(sampler.get_random_value(1, 6)) for _ in range(300)}
+    assert lengths == {2, 3, 4, 5, 6}
+
+
+@pytest.mark.parametrize(
+    "pattern,min_length,max_length",
+    [(r"\d{3}", 4, 10), (r"(ab)+", 3, 3), (r"a|bcd", 2, 2)],
+)
+def test_regex_sampler_impossible_length(pattern, min_length, max_length):
+    with pytest.raises(ValueError) as exc_info:
+        get_regex_sampler(pattern).get_random_value(min_length, max_length)
+    assert str(exc_info.value) == (
+        f"Regex {pattern} has no values with length from {min_length} to {max_length}"
+    )
+
+
+def test_regex_sampler_bounded_length_with_group_reference():
+    value = get_regex_sampler(r"(\d)-\1").get_random_value(0, 10)
+    assert re.fullmatch(r"(\d)-\1", value)
+
+
+def test_regex_sampler_long_bounded_length():
+    pattern = r"[a-z]+\d*-[A-Z]*"
+    sampler = RegexSampler(pattern)
+    with randomizer.use_size_profile("uniform"):
+        values = [sampler.get_random_value(0, 20000) for _ in range(5)]
+    for value in values:
+        assert re.fullmatch(pattern, value)
+        assert len(value) <= 20000
+
+
+def test_regex_sampler_bounded_length_in_threads():
+    pattern = r"[a-z]+\d*(ab|c)+"
+
+    def generate(i):
+        sampler = get_regex_sampler(pattern)
+        return [sampler.get_random_value(1, 8 + (i + k) % 40) for k in range(20)]
+
+    with ThreadPoolExecutor(6) as executor:
+        values = [value for chunk in executor.map(generate, range(60)) for value in chunk]
+    assert all(re.fullmatch(pattern, value) for value in values)
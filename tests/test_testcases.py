@@ -1,3 +1,5 @@
+from ttoolly.elements.common import Form
+from ttoolly import generator
 from ttoolly.testcases import Case
 import pytest
 
@@ -72,3 +74,20 @@ def test_get_callable_description():
 
     testcase = Case(lambda *a, **k: None, name=f"test_name", description=d, a=2, b=10)
     assert testcase.get_steps() == "text 2 20"
+
+
+def test_generated_tests_have_own_unique_values():
+    def _test(self, form, *args, **kwargs):
+        return {form.get_random_data(["f1"])["f1"] for _ in range(2)}
+
+    class Cases:
+        @classmethod
+        def get_tests(cls, form):
+            return [Case(_test, name=f"test_{i}", form=form) for i in range(3)]
+
+    class Tests(metaclass=generator.TestCaseMeta):
+        form = Form(fields={"f1": {"type": "bool", "unique": True}})
+        cases = [[Cases]]
+
+    for i in range(3):
+        assert getattr(Tests(), f"test_{i}")() == {False, True}
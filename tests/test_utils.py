@@ -1,4 +1,9 @@
+from decimal import Decimal
 from ttoolly import utils
+import io
+import struct
+import sys
+from unittest import mock
 import re
 import pytest
 
@@ -129,6 +134,35 @@ def test_get_randname_long_all_default():
     assert re.match(r"([\s\S]{10})\1[\s\S]{5}", value, re.MULTILINE)
 
 
+@pytest.mark.parametrize(
+    "_type,pattern",
+    (
+        ("d", r"^\d{1000}$"),
+        ("w", r"^[a-zA-Z]{1000}$"),
+        ("wd.-", r"^[a-zA-Z\d\.\-]{1000}$"),
+        ("-", r"^-{1000}$"),
+        ("a", r"^[\S\s]{1000}$"),
+    ),
+)
+def test_get_random_string(_type, pattern):
+    value = utils.randomizer.get_random_string(1000, _type)
+    assert re.match(pattern, value)
+    assert value[:10] * 100 != value or _type == "-"
+
+
+def test_get_random_chars_uniform():
+    value = utils.randomizer.get_random_chars(70000, "abc\u0436")
+    assert len(value) == 70000
+    assert all(15000 < value.count(s) < 20000 for s in "abc\u0436")
+    value = utils.randomizer.get_random_chars(30000, "abc")
+    assert all(9000 < value.count(s) < 11000 for s in "abc")
+
+
+def test_get_random_chars_empty_alphabet():
+    with pytest.raises(ValueError, match="Alphabet can not be empty"):
+        utils.randomizer.get_random_chars(10, "")
+
+
 def test_get_all_subclasses():
     class A:
         pass
@@ -173,3 +207,257 @@ def test_get_random_email_value_too_short():
     with pytest.raises(ValueError) as exc_info:
         utils.randomizer.get_random_email_value(2)
     assert str(exc_info.value) == "Email length cannot be less than 3"
+
+
+@pytest.mark.parametrize(
+    "value,expected",
+    [("1", 0), ("1.0", 0), ("1.50", 2), ("-0.005", 3), ("123.4", 1), ("1E+3", 0)],
+)
+def test_get_decimal_places(value, expected):
+    assert utils.get_decimal_places(Decimal(value)) == expected
+
+
+@pytest.mark.parametrize(
+    "value,places,expected",
+    [("1", 2, 100), ("-0.05", 2, -5), ("1E+3", 1, 10000), ("2.50", 1, 25)],
+)
+def test_decimal_to_scaled_int(value, places, expected):
+    assert utils.decimal_to_scaled_int(Decimal(value), places) == expected
+
+
+def test_scaled_int_to_decimal():
+    value = utils.scaled_int_to_decimal(10**400 + 5, 2)
+    assert value.as_tuple().exponent == -2
+    assert utils.decimal_to_scaled_int(value, 2) == 10**400 + 5
+
+
+@pytest.mark.parametrize(
+    "profile,min_length,max_length,expected",
+    [
+        ("uniform", 0, None, range(1, 100001)),
+        ("uniform", 5, 10, range(5, 11)),
+        ("minimal", 0, None, {1}),
+        ("minimal", 7, 100, {7}),
+        ("realistic", 0, None, range(1, 256)),
+        ("realistic", 300, None, {300}),
+        ("realistic", 3, 5, range(3, 6)),
+        ("boundary", 0, None, {1, 2, 99999, 100000}),
+        ("boundary", 5, 10, {5, 6, 9, 10}),
+        ("boundary", 5, 5, {5}),
+    ],
+)
+def test_size_profile_get_length(profile, min_length, max_length, expected):
+    size_profile = utils.randomizer.get_size_profile(profile)
+    for _ in range(100):
+        assert size_profile.get_length(min_length, max_length) in expected
+
+
+def test_use_size_profile():
+    assert utils.randomizer.get_size_profile() is utils.randomizer.size_profiles[
+        utils.randomizer.DEFAULT_SIZE_PROFILE
+    ]
+    with utils.randomizer.use_size_profile("minimal"):
+        assert utils.randomizer.get_size_profile().get_length(0, 100) == 1
+        with utils.randomizer.use_size_profile(None):
+            assert utils.randomizer.get_size_profile().get_length(0, 100) == 1
+
+
+def test_unknown_size_profile():
+    with pytest.raises(ValueError) as exc_info:
+        utils.randomizer.get_size_profile("other")
+    assert str(exc_info.value) == (
+        'Unknown size profile "other". Available profiles: uniform, minimal, realistic, boundary'
+    )
+
+
+@pytest.mark.parametrize("filename", ["img.png", "img.svg", "img.bmp", "img"])
+def test_get_random_image(filename):
+    if filename == "img":
+        # image without extension is JPEG
+        pytest.importorskip("PIL")
+    f = utils.randomizer.get_random_image(filename=filename, size="20K")
+    assert isinstance(f, io.BytesIO)
+    assert f.name == filename
+    assert len(f.read()) == len(f.getvalue()) == 20 * 1024
+
+
+@pytest.mark.parametrize("filename", ["img.png", "img.svg", "img.bmp"])
+def test_get_random_padded_image(filename):
+    kwargs = {"filename": filename, "size": "20K", "width": 5, "height": 5, "seed": 1}
+    f = utils.randomizer.get_random_padded_image(**kwargs)
+    assert isinstance(f, utils.randomizer.PaddedFile)
+    assert f.name == filename
+    assert f.read() == utils.randomizer.get_random_image(**kwargs).getvalue()
+
+
+def test_padded_file():
+    f = utils.randomizer.PaddedFile(b"head", 100000, b"a", b"tail", name="f.txt")
+    expected = b"head" + b"a" * 100000 + b"tail"
+    assert f.read() == expected
+    assert f.tell() == len(expected) == f.size
+    assert f.read() == b""
+    f.seek(2)
+    assert f.read(10) == expected[2:12]
+    assert f.tell() == 12
+    f.seek(-6, io.SEEK_END)
+    assert f.read() == b"aatail"
+    f.seek(0)
+    chunks = iter(lambda: f.read(7777), b"")
+    assert b"".join(chunks) == expected
+
+
+def test_padded_file_is_virtual():
+    f = utils.randomizer.PaddedFile(b"head", 2**40)
+    f.seek(-3, io.SEEK_END)
+    assert f.read() == b"\0\0\0"
+    assert f.size == 2**40 + 4
+
+
+@pytest.mark.parametrize("extension", ["png", "svg"])
+def test_get_padded_image(extension):
+    f = utils.randomizer.get_padded_image(extension, "1M", 10, 10, name="img")
+    content = f.read()
+    assert len(content) == 1024 * 1024
+    if extension == "svg":
+        assert content.endswith(b"aaa -->")
+    else:
+        assert content.endswith(b"\0\0\0")
+
+
+def test_write_random_svg_content():
+    class Sink:
+        def __init__(self):
+            self.chunks = []
+
+        def write(self, chunk):
+            self.chunks.append(len(chunk))
+
+    sink = Sink()
+    size = 10 * 1024 * 1024
+    assert utils.randomizer.write_random_svg_content(sink, size, 10, 10) == size
+    assert sum(sink.chunks) == size
+    assert max(sink.chunks) <= utils.randomizer.WRITE_CHUNK_SIZE
+    content = utils.randomizer.get_random_svg_content(1000, 10, 20, seed=1)
+    assert len(content) == 1000
+    assert content.startswith(b'<?xml version="1.0" standalone="no"?>')
+    assert b'<svg width="10" height="20"' in content
+    assert content == utils.randomizer.get_random_svg_content(1000, 10, 20, seed=1)
+
+
+@pytest.mark.parametrize("safe", [False, True])
+def test_get_random_email_values(safe):
+    lengths = list(range(3, 300))
+    values = utils.randomizer.get_random_email_values(lengths, safe=safe)
+    assert [len(value) for value in values] == lengths
+    for value in values:
+        username, domain = value.rsplit("@", 1)
+        assert len(username) <= 64
+        assert ".." not in value
+        assert not username.startswith(".") and not username.endswith(".")
+        if safe:
+            assert re.match(r"^[a-z0-9]+$", username)
+
+
+def test_get_random_domain_values():
+    lengths = list(range(4, 300))
+    values = utils.randomizer.get_random_domain_values(lengths)
+    assert [len(value) for value in values] == lengths
+    for value in values:
+        assert re.match(
+            r"^(?:[a-z0-9](?:[a-z0-9-]{0,61}[a-z0-9])?\.)+[a-z]{2,6}$", value
+        )
+
+
+@pytest.mark.parametrize(
+    "_format,signature,dimensions",
+    [
+        ("BMP", b"BM", (18, "<ii")),
+        ("PNG", b"\x89PNG\r\n\x1a\n", (16, ">II")),
+        ("GIF", b"GIF89a", (6, "<HH")),
+    ],
+)
+def test_get_random_img_content_without_pillow(_format, signature, dimensions):
+    offset, dimensions_format = dimensions
+    with mock.patch.dict(sys.modules, {"PIL": None}):
+        content = utils.randomizer.get_random_img_content(_format, 0, 30, 20, seed=1)
+    assert content.startswith(signature)
+    assert struct.unpack_from(dimensions_format, content, offset) == (30, 20)
+    assert content == utils.randomizer.get_random_img_content(_format, 0, 30, 20, seed=1)
+
+
+@pytest.mark.parametrize("_format", ["BMP", "PNG", "GIF"])
+@pytest.mark.parametrize("rich", [False, True])
+@pytest.mark.parametrize("width,height", [(1, 1), (7, 3), (300, 200)])
+def test_get_random_img_content_is_valid(_format, rich, width, height):
+    Image = pytest.importorskip("PIL.Image")
+    content = utils.randomizer.get_random_img_content(
+        _format, 0, width, height, seed=2, rich=rich
+    )
+    image = Image.open(io.BytesIO(content))
+    image.load()
+    assert image.format == _format
+    assert image.size == (width, height)
+    colors = image.convert("RGB").getcolors()
+    assert (len(colors) == 1) is not rich or min(width, height) < 3
+
+
+@pytest.mark.parametrize("length", [0, 1, 2, 3, 10, 99, 1000])
+def test_get_random_text(length):
+    from ttoolly.utils import corpus
+
+    for _ in range(20):
+        text = corpus.get_random_text(length)
+        assert len(text) == length
+        assert text == text.strip()
+        assert "  " not in text
+
+
+def test_word_corpus_from_file(tmp_path):
+    from ttoolly.utils import corpus
+
+    path = tmp_path / "words.txt"
+    path.write_text("alpha\n\nbeta\r\n  \nгамма\n")
+    words = corpus.WordCorpus(str(path))
+    assert [words[i] for i in range(len(words))] == ["alpha", "beta", "гамма"]
+    text = corpus.get_random_text(200, str(path))
+    assert len(text) == 200
+    assert set(re.findall(r"\w+", text.lower())[:-1]) <= {"alpha", "beta", "гамма"}
+
+
+def test_word_corpus_empty(tmp_path):
+    from ttoolly.utils import corpus
+
+    path = tmp_path / "words.txt"
+    path.write_text("\n \n")
+    with pytest.raises(ValueError) as exc_info:
+        corpus.WordCorpus(str(path))
+    assert str(exc_info.value) == f'Words corpus "{path}" is empty'
+
+
+def test_get_random_default():
+    import random
+
+    assert utils.randomizer.get_random() is random
+    rng = random.Random(1)
+    with utils.randomizer.use_random(rng):
+        assert utils.randomizer.get_random() is rng
+    assert utils.randomizer.get_random() is random
+
+
+def test_global_seed_controls_values():
+    import random
+
+    from ttoolly.elements.common import Form
+
+    form = Form(
+        fields={
+            "f1": {"type": "str", "required": True},
+            "f2": {"type": "int", "required": True},
+            "f3": {"type": "date", "required": True},
+        }
+    )
+    values = []
+    for _ in range(2):
+        random.seed(1)
+        values.append(form.get_random_data())
+    assert values[0] == values[1]
@@ -0,0 +1,135 @@
+import sys
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from ttoolly.elements import common
+from ttoolly.elements.common import Form
+from ttoolly.utils import vectorized
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize(
+    "first,steps,step",
+    [(0, 10, 1), (-(2**63), 2**64 - 1, 1), (-5, 4, 3), (2**63 - 10, 3, 3)],
+)
+def test_get_random_integers(first, steps, step):
+    values = vectorized.get_random_integers(
+        vectorized.get_generator(), first, steps, step, 1000
+    )
+    assert len(values) == 1000
+    assert all(isinstance(v, int) for v in values)
+    assert all(first <= v <= first + steps * step for v in values)
+    assert all((v - first) % step == 0 for v in values)
+
+
+@pytest.mark.parametrize(
+    "first,steps,step", [(2**63, 10, 1), (0, 2**63, 1), (-(2**63) - 1, 1, 1)]
+)
+def test_get_random_integers_out_of_int64(first, steps, step):
+    assert (
+        vectorized.get_random_integers(
+            vectorized.get_generator(), first, steps, step, 10
+        )
+        is None
+    )
+
+
+@pytest.mark.parametrize(
+    "field,check",
+    [
+        (
+            common.FieldInt(min_value=-7, max_value=20, step=3),
+            lambda v: isinstance(v, int) and -7 <= v <= 20 and v % 3 == 0,
+        ),
+        (common.FieldInt(), lambda v: isinstance(v, int)),
+        (
+            common.FieldInt(min_value=0, max_value=sys.maxsize * 4),
+            lambda v: isinstance(v, int) and 0 <= v <= sys.maxsize * 4,
+        ),
+        (
+            common.FieldSmallInt(),
+            lambda v: isinstance(v, int) and -32768 <= v <= 32767,
+        ),
+        (
+            common.FieldDecimal(min_value="-1.5", max_value="1.5", step="0.25"),
+            lambda v: isinstance(v, Decimal)
+            and Decimal("-1.5") <= v <= Decimal("1.5")
+            and v % Decimal("0.25") == 0,
+        ),
+        (common.FieldDecimal(), lambda v: isinstance(v, Decimal)),
+        (
+            common.FieldDate(
+                min_value=date(2020, 1, 1),
+                max_value=date(2020, 3, 1),
+                step=timedelta(days=2),
+            ),
+            lambda v: type(v) is date
+            and date(2020, 1, 1) <= v <= date(2020, 3, 1)
+            and (v - date(2020, 1, 1)).days % 2 == 0,
+        ),
+        (
+            common.FieldDate(max_value=date(2020, 3, 1), step=timedelta(days=7)),
+            lambda v: type(v) is date
+            and date(2020, 1, 1) <= v <= date(2020, 3, 1)
+            and (date(2020, 3, 1) - v).days % 7 == 0,
+        ),
+        (
+            common.FieldDate(),
+            lambda v: type(v) is date and v.month == date.today().month,
+        ),
+        (
+            common.FieldDateTime(
+                min_value=datetime(2020, 1, 1, 10),
+                max_value=datetime(2020, 1, 1, 12),
+                step=timedelta(minutes=15),
+            ),
+            lambda v: isinstance(v, datetime)
+            and datetime(2020, 1, 1, 10) <= v <= datetime(2020, 1, 1, 12)
+            and v.minute % 15 == 0
+            and v.second == 0,
+        ),
+        (
+            common.FieldDateTime(
+                min_value=datetime(2020, 1, 1, 10, tzinfo=timezone(timedelta(hours=3)))
+            ),
+            lambda v: v.tzinfo == timezone(timedelta(hours=3))
+            and v >= datetime(2020, 1, 1, 10, tzinfo=timezone(timedelta(hours=3))),
+        ),
+        (
+            common.FieldTime(
+                min_value=time(9), max_value=time(18), step=timedelta(minutes=30)
+            ),
+            lambda v: isinstance(v, time)
+            and time(9) <= v <= time(18)
+            and v.minute in (0, 30)
+            and v.second == 0,
+        ),
+    ],
+)
+def test_field_get_random_values_numpy(field, check):
+    values = field.get_random_values(500, generator=vectorized.get_generator())
+    assert len(values) == 500
+    assert all(check(v) for v in values), values
+
+
+def test_get_random_data_batch_numpy():
+    form = Form(
+        fields={
+            "f1": {"type": "int", "min_value": 0, "max_value": 10},
+            "f2": {"type": "str", "max_length": 10},
+        }
+    )
+    batch = form.get_random_data_batch(100, ["f1", "f2"], backend="numpy")
+    assert set(batch.columns["f1"]).issubset(range(11))
+    assert all(isinstance(v, str) for v in batch.columns["f2"])
+
+
+def test_get_random_data_batch_unknown_backend():
+    form = Form(fields={"f1": {"type": "int"}})
+    with pytest.raises(ValueError) as exc_info:
+        form.get_random_data_batch(1, ["f1"], backend="other")
+    assert str(exc_info.value) == (
+        'Unknown backend "other". Available backends: python, numpy'
+    )
@@ -0,0 +1,51 @@
+import os
+from collections.abc import Iterator
+
+from ttoolly.elements.common import Form
+from ttoolly.loaders import JsonLoader
+
+
+class FormCatalog:
+    """
+    All form configs from directory, by config path relative to it without extension.
+    Structurally identical field definitions are shared between forms as one frozen field
+    """
+
+    def __init__(
+        self, path: str, form_class=Form, loader=JsonLoader, extensions=(".json",)
+    ):
+        self.path = path
+        self.field_cache = {}
+        self.forms = {}
+        for dirpath, dirnames, filenames in os.walk(path):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                name, ext = os.path.splitext(filename)
+                if ext.lower() not in extensions:
+                    continue
+                file_path = os.path.join(dirpath, filename)
+                name = os.path.splitext(os.path.relpath(file_path, path))[0]
+                name = name.replace(os.sep, "/")
+                data = loader(file_path).data
+                self.forms[name] = form_class(**data, field_cache=self.field_cache)
+
+    def __getitem__(self, name: str) -> Form:
+        return self.forms[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.forms
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.forms)
+
+    def __len__(self) -> int:
+        return len(self.forms)
+
+    def get(self, name: str, default=None) -> Form | None:
+        return self.forms.get(name, default)
+
+    def get_fields_count(self) -> int:
+        """
+        Count of distinct field objects in catalog
+        """
+        return len(self.field_cache)
@@ -29,7 +29,7 @@ def _main(data, humanable=False):
     mcs = TestCaseMeta
 
     class T:
-        form = Form(**data)
+        form = Form(**data, lazy=humanable)
         cases = [
             CasesAdd,
         ]
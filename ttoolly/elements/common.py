@@ -1,21 +1,92 @@
-import decimal
 import inspect
+import itertools
 import math
+import re
 import sys
-from collections.abc import Iterable, Iterator
-from datetime import date, datetime, time, timedelta
+import threading
+import warnings
+from collections import OrderedDict
+from contextlib import contextmanager
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
+from datetime import date, datetime, time, timedelta, timezone
 from decimal import Decimal
+from fractions import Fraction
 from functools import cached_property
-from random import choice, randint, uniform
+from random import Random, random
 from types import UnionType
-from uuid import uuid4
+from uuid import UUID
 
-import rstr
-from faker import Faker
-from ttoolly.utils import convert_size_to_bytes, get_all_subclasses, randomizer
-import re
+from ttoolly.pools import UNIQUE_ATTEMPTS, ValuePool
+from ttoolly.relations import RelatedSampler
+from ttoolly.uniqueness import UniqueIndex
+from ttoolly.utils import corpus, encoders, images
+from ttoolly.utils.regex import get_regex_sampler
+from ttoolly.utils import (
+    convert_size_to_bytes,
+    decimal_to_scaled_int,
+    get_all_subclasses,
+    get_decimal_places,
+    get_definition_key,
+    get_faker,
+    randomizer,
+    scaled_int_to_decimal,
+    vectorized,
+)
+
+
+def __getattr__(name):
+    if name == "fake":
+        return get_faker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Longest range for random.choices, it is uniform only for ranges much shorter than 2 ** 53
+CHOICES_MAX_LENGTH = 2**32
+
+EPOCH = datetime(1970, 1, 1)
+EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+VALIDATED_DEFINITIONS_SIZE = 4096
+
+
+class ValidatedDefinitions:
+    """
+    Keys of field definitions which passed validation,
+    no more than maxsize recently used ones are kept
+    """
+
+    def __init__(self, maxsize: int = VALIDATED_DEFINITIONS_SIZE):
+        self.maxsize = maxsize
+        self._keys = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            if key not in self._keys:
+                return False
+            self._keys.move_to_end(key)
+            return True
+
+    def add(self, key: Hashable) -> None:
+        with self._lock:
+            self._keys[key] = None
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
 
-fake = Faker()
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+
+validated_definitions = ValidatedDefinitions()
+
+
+def is_filled(payload: Mapping, name: str) -> bool:
+    return name in payload and payload[name] not in (None, "", [], {})
 
 
 class Condition:
@@ -33,6 +104,40 @@ class Condition:
             data = [data]
         self.cases = data
 
+    @cached_property
+    def compiled_cases(self) -> list[tuple[tuple[str, ...], tuple[tuple, ...]]]:
+        """
+        For each case fields which must be not filled and (field, value) pairs which must be equal
+        """
+        return [
+            (
+                tuple(k for k, v in case.items() if not v),
+                tuple((k, v) for k, v in case.items() if v),
+            )
+            for case in self.cases
+        ]
+
+    def compile(self) -> Callable[[Mapping], bool]:
+        """
+        Predicate over payload, True if condition is met
+        """
+        if self.filled:
+            filled = self.filled
+            return lambda payload: is_filled(payload, filled)
+        if not self.cases:
+            return lambda payload: True
+        cases = self.compiled_cases
+
+        def predicate(payload: Mapping) -> bool:
+            for not_filled, values in cases:
+                if not any(is_filled(payload, k) for k in not_filled) and all(
+                    k in payload and payload[k] == v for k, v in values
+                ):
+                    return True
+            return False
+
+        return predicate
+
     @classmethod
     def validate(cls, **kwargs):
         message = (
@@ -99,22 +204,65 @@ class Field:
     unique: Unique | bool = False
 
     def __init__(self, **kwargs):
-        self.validate(**kwargs)
+        if not self.__dict__.pop("_trusted", False):
+            self.validate(**kwargs)
+        for k, v in self.pop_conditions(kwargs).items():
+            setattr(self, k, v)
+        for k, v in kwargs.items():
+            setattr(self, k, v)
+
+    @classmethod
+    def pop_conditions(cls, kwargs: dict) -> dict:
+        """
+        Parse required, not_empty, only and unique from field definition
+        """
+        result = {"required": cls.required, "only": cls.only, "unique": cls.unique}
         if required := kwargs.pop("required", None):
-            self.required = Condition(required)
+            result["required"] = Condition(required)
         if (not_empty := kwargs.pop("not_empty", None)) is None:
             # TODO: usually different behavior of api and form-based
-            self.not_empty = self.required
+            result["not_empty"] = result["required"]
         elif not_empty:
-            self.not_empty = Condition(not_empty)
+            result["not_empty"] = Condition(not_empty)
         else:
-            self.not_empty = False
+            result["not_empty"] = False
         if only := kwargs.pop("only", None):
-            self.only = Condition(only)
+            result["only"] = Condition(only)
         if unique := kwargs.pop("unique", None):
-            self.unique = Unique(unique)
-        for k, v in kwargs.items():
-            setattr(self, k, v)
+            result["unique"] = Unique(unique)
+        return result
+
+    def get_random_values(self, count: int, generator=None) -> list:
+        """
+        Column of count random values.
+        Fields which support NumPy backend use generator (numpy.random.Generator) if it is passed
+        """
+        get_random_value = self.get_random_value
+        return [get_random_value() for _ in range(count)]
+
+    def __setattr__(self, k, v):
+        if self.__dict__.get("_frozen"):
+            raise AttributeError(
+                f'Field "{self.name}" is shared between forms and can not be changed'
+            )
+        super().__setattr__(k, v)
+
+    @classmethod
+    def trusted(cls, **kwargs):
+        """
+        Create field from already validated definition, without validation
+        """
+        field = cls.__new__(cls)
+        field.__dict__["_trusted"] = True
+        field.__init__(**kwargs)
+        return field
+
+    def freeze(self):
+        """
+        Make field immutable, so it can be shared between forms
+        """
+        self.__dict__["_frozen"] = True
+        return self
 
     @classmethod
     def get_template(cls):
@@ -183,10 +331,37 @@ class FieldInt(Field):
     step: int = 1
 
     def get_random_value(self) -> int:
-        value = randint(self.min_value, self.max_value)
+        value = randomizer.get_random().randint(self.min_value, self.max_value)
         value = value - value % self.step
         return value
 
+    def _get_integer_range(self) -> tuple[int, int, int]:
+        """
+        First value, count of steps and step. Values are multiples of step
+        """
+        first = self.min_value + (-self.min_value) % self.step
+        return first, (self.max_value - first) // self.step, self.step
+
+    def _to_integer(self, value) -> int:
+        return value
+
+    def _from_integer(self, value: int) -> int:
+        return value
+
+    def get_random_values(self, count: int, generator=None) -> list[int]:
+        first, steps, step = self._get_integer_range()
+        if generator is not None:
+            values = vectorized.get_random_integers(
+                generator, first, steps, step, count
+            )
+            if values is not None:
+                return values
+        if not 0 <= steps < CHOICES_MAX_LENGTH:
+            return super().get_random_values(count)
+        return randomizer.get_random().choices(
+            range(first, self.max_value + 1, step), k=count
+        )
+
     @classmethod
     def validate(cls, **kwargs):
         super().validate(**kwargs)
@@ -228,38 +403,66 @@ class FieldDecimal(Field):
         super().__init__(**kwargs)
         if "step" in kwargs.keys() and "max_decimal_places" not in kwargs.keys():
             self.max_decimal_places = max(
-                [
-                    len(
-                        str(
-                            kwargs[field_name] % int(kwargs[field_name])
-                            if abs(kwargs[field_name]) > 1
-                            else kwargs[field_name]
-                        ).split(".")[1]
-                    )
-                    if int(kwargs[field_name]) != kwargs[field_name]
-                    else 0
-                    for field_name in ("max_value", "min_value", "step")
-                ]
+                get_decimal_places(getattr(self, field_name))
+                for field_name in ("max_value", "min_value", "step")
             )
         elif "max_decimal_places" in kwargs.keys() and "step" not in kwargs.keys():
             self.step = Decimal("0.1") ** kwargs["max_decimal_places"]
 
-    def get_random_value(self) -> Decimal:
-        if self.min_value < 0 and self.max_value > 0:
-            """For big numbers, like sys.float_info.max"""
-            if randint(0, 1):
-                value = uniform(0, float(self.max_value))
-            else:
-                value = uniform(float(self.min_value), 0)
-        else:
-            value = uniform(float(self.min_value), float(self.max_value))
-        value = Decimal(value)
-        with decimal.localcontext() as ctx:
-            ctx.prec = 1000
-            value = value - value % self.step
-            value = value.quantize(self.step)
+    @cached_property
+    def _scaled(self) -> tuple[int, int, int, int]:
+        """
+        Decimal places, min_value, max_value and step as integers scaled by 10 ** places
+        """
+        places = max(
+            self.max_decimal_places,
+            *(get_decimal_places(v) for v in (self.min_value, self.max_value, self.step)),
+        )
+        return (places,) + tuple(
+            decimal_to_scaled_int(v, places)
+            for v in (self.min_value, self.max_value, self.step)
+        )
 
-        return value
+    def _get_integer_range(self) -> tuple[int, int, int]:
+        """
+        First value, count of steps and step scaled by 10 ** places
+        """
+        places, min_value, max_value, step = self._scaled
+        min_steps, max_steps = -(-min_value // step), max_value // step
+        return min_steps * step, max_steps - min_steps, step
+
+    def _to_integer(self, value) -> Fraction:
+        return Fraction(value) * 10 ** self._scaled[0]
+
+    def _from_integer(self, value: int) -> Decimal:
+        return scaled_int_to_decimal(value, self._scaled[0])
+
+    def get_random_value(self) -> Decimal:
+        places, min_value, max_value, step = self._scaled
+        min_steps, max_steps = -(-min_value // step), max_value // step
+        if min_steps > max_steps:
+            return scaled_int_to_decimal(min_value, places)
+        value = randomizer.get_random().randint(min_steps, max_steps) * step
+        return scaled_int_to_decimal(value, places)
+
+    def get_random_values(self, count: int, generator=None) -> list[Decimal]:
+        places, min_value, max_value, step = self._scaled
+        min_steps, max_steps = -(-min_value // step), max_value // step
+        values = None
+        if generator is not None:
+            values = vectorized.get_random_integers(
+                generator, min_steps * step, max_steps - min_steps, step, count
+            )
+        if values is None:
+            if not 0 <= max_steps - min_steps < CHOICES_MAX_LENGTH:
+                return super().get_random_values(count)
+            values = [
+                steps * step
+                for steps in randomizer.get_random().choices(
+                    range(min_steps, max_steps + 1), k=count
+                )
+            ]
+        return [scaled_int_to_decimal(value, places) for value in values]
 
     @classmethod
     def validate(cls, **kwargs):
@@ -269,17 +472,7 @@ class FieldDecimal(Field):
             expected_step = Decimal("0.1") ** kwargs["max_decimal_places"]
             for field_name in ("max_value", "min_value", "step"):
                 if field_name in kwargs.keys():
-                    value_decimal_places = (
-                        len(
-                            str(
-                                kwargs[field_name] % int(kwargs[field_name])
-                                if abs(kwargs[field_name]) > 1
-                                else kwargs[field_name]
-                            ).split(".")[1]
-                        )
-                        if int(kwargs[field_name]) != kwargs[field_name]
-                        else 0
-                    )
+                    value_decimal_places = get_decimal_places(kwargs[field_name])
                     if value_decimal_places > kwargs["max_decimal_places"]:
                         raise ValueError(
                             f"With max_decimal_places {kwargs['max_decimal_places']} {field_name} couldn't be {kwargs[field_name]}. Maybe {expected_step}?"
@@ -292,18 +485,64 @@ class FieldDecimal(Field):
             raise ValueError(
                 f'Max_value ({max_value}) can not be less than min_value ({min_value})'
             )
-        if step < 0:
+        if step <= 0:
             raise ValueError(f'Step must be positive. Now {step}')
-        if (max_value - min_value) > 0:
-            with decimal.localcontext() as ctx:
-                ctx.prec = 1000
-                if (max_value - min_value) % step > 0:
-                    raise ValueError(
-                        f'Difference between min_value ({min_value}) and max_value ({max_value}) must be divided by step ({step}) without reminder'
-                    )
+        places = max(get_decimal_places(v) for v in (max_value, min_value, step))
+        max_value_scaled, min_value_scaled, step_scaled = (
+            decimal_to_scaled_int(v, places) for v in (max_value, min_value, step)
+        )
+        if (max_value_scaled - min_value_scaled) % step_scaled:
+            raise ValueError(
+                f'Difference between min_value ({min_value}) and max_value ({max_value}) must be divided by step ({step}) without reminder'
+            )
+
+
+class IntegerRangeMixin:
+    """
+    Values are first + k * step integers converted by _from_integer.
+    Range is computed by _compute_integer_range once,
+    or once per day if there are no min_value and max_value, as bounds depend on today
+    """
+
+    def _get_integer_range(self) -> tuple[int, int, int]:
+        cached = self.__dict__.get("_integer_range")
+        if cached is not None and cached[0] is None:
+            return cached[1]
+        today = None
+        if self.min_value is None and self.max_value is None:
+            today = date.today()
+        if cached is None or cached[0] != today:
+            # Written to __dict__ directly, as cached_property, so it works for frozen fields
+            cached = self.__dict__["_integer_range"] = (
+                today,
+                self._compute_integer_range(),
+            )
+        return cached[1]
+
+    def get_random_value(self):
+        first, steps, step = self._get_integer_range()
+        return self._from_integer(
+            first + randomizer.get_random().randint(0, steps) * step
+        )
+
+    def get_random_values(self, count: int, generator=None) -> list:
+        first, steps, step = self._get_integer_range()
+        values = None
+        if generator is not None:
+            values = vectorized.get_random_integers(
+                generator, first, steps, step, count
+            )
+        if values is None:
+            if not 0 <= steps < CHOICES_MAX_LENGTH:
+                return super().get_random_values(count)
+            values = [
+                first + k * step
+                for k in randomizer.get_random().choices(range(steps + 1), k=count)
+            ]
+        return [self._from_integer(value) for value in values]
 
 
-class FieldDate(Field):
+class FieldDate(IntegerRangeMixin, Field):
     type_of = "date"
     max_value: date | None = None
     min_value: date | None = None
@@ -311,18 +550,33 @@ class FieldDate(Field):
     lte: Iterable[str] = []
     step: timedelta = timedelta(days=1)
 
-    def get_random_value(self):
+    def _get_bounds(self) -> tuple[date, date]:
         if self.max_value and self.min_value:
-            return fake.date_between_dates(self.min_value, self.max_value)
+            return self.min_value, self.max_value
         if self.max_value:
-            return fake.date_between_dates(
-                self.max_value - timedelta(days=30), self.max_value
-            )
+            return self.max_value - timedelta(days=30), self.max_value
         if self.min_value:
-            return fake.date_between_dates(
-                self.min_value, self.min_value + timedelta(days=30)
-            )
-        return fake.date_this_month()
+            return self.min_value, self.min_value + timedelta(days=30)
+        month_start = date.today().replace(day=1)
+        month_end = (month_start + timedelta(days=32)).replace(day=1)
+        return month_start, month_end - timedelta(days=1)
+
+    def _compute_integer_range(self) -> tuple[int, int, int]:
+        """
+        First value, count of steps and step in days
+        """
+        min_value, max_value = self._get_bounds()
+        step = max(self.step // timedelta(days=1), 1)
+        steps = (max_value - min_value).days // step
+        if self.max_value and not self.min_value:
+            return max_value.toordinal() - steps * step, steps, step
+        return min_value.toordinal(), steps, step
+
+    def _to_integer(self, value: date) -> int:
+        return value.toordinal()
+
+    def _from_integer(self, value: int) -> date:
+        return date.fromordinal(value)
 
     @classmethod
     def validate(cls, **kwargs):
@@ -344,7 +598,7 @@ class FieldDate(Field):
                     )
 
 
-class FieldDateTime(Field):
+class FieldDateTime(IntegerRangeMixin, Field):
     type_of = "datetime"
     max_value: datetime | None = None
     min_value: datetime | None = None
@@ -352,18 +606,43 @@ class FieldDateTime(Field):
     lte: Iterable[str] = []
     step: timedelta = timedelta(seconds=1)
 
-    def get_random_value(self):
+    def _get_bounds(self) -> tuple[datetime, datetime]:
         if self.max_value and self.min_value:
-            return randomizer.get_random_datetime_value(self.min_value, self.max_value)
+            return self.min_value, self.max_value
         if self.max_value:
-            return randomizer.get_random_datetime_value(
-                self.max_value - timedelta(days=30), self.max_value
-            )
+            return self.max_value - timedelta(days=30), self.max_value
         if self.min_value:
-            return randomizer.get_random_datetime_value(
-                self.min_value, self.min_value + timedelta(days=30)
-            )
-        return randomizer.get_random_datetime_value()
+            return self.min_value, self.min_value + timedelta(days=30)
+        month_start = datetime.combine(date.today().replace(day=1), time.min)
+        month_end = (month_start + timedelta(days=32)).replace(day=1)
+        return month_start, month_end - timedelta(microseconds=1)
+
+    def _get_epoch(self) -> datetime:
+        if (self.min_value or self.max_value or datetime.min).tzinfo:
+            return EPOCH_UTC
+        return EPOCH
+
+    def _compute_integer_range(self) -> tuple[int, int, int]:
+        """
+        First value, count of steps and step in microseconds from epoch
+        """
+        min_value, max_value = self._get_bounds()
+        epoch = self._get_epoch()
+        step = max(self.step // timedelta(microseconds=1), 1)
+        steps = (max_value - min_value) // timedelta(microseconds=step)
+        if self.max_value and not self.min_value:
+            last = (max_value - epoch) // timedelta(microseconds=1)
+            return last - steps * step, steps, step
+        return (min_value - epoch) // timedelta(microseconds=1), steps, step
+
+    def _to_integer(self, value: datetime) -> int:
+        return (value - self._get_epoch()) // timedelta(microseconds=1)
+
+    def _from_integer(self, value: int) -> datetime:
+        result = self._get_epoch() + timedelta(microseconds=value)
+        if result.tzinfo:
+            return result.astimezone((self.min_value or self.max_value).tzinfo)
+        return result
 
     @classmethod
     def validate(cls, **kwargs):
@@ -383,7 +662,7 @@ class FieldDateTime(Field):
                     )
 
 
-class FieldTime(Field):
+class FieldTime(IntegerRangeMixin, Field):
     type_of = "time"
     max_value: time = time.max
     min_value: time = time.min
@@ -391,11 +670,25 @@ class FieldTime(Field):
     lte: Iterable[str] = []
     step: timedelta = timedelta(microseconds=1)
 
-    def get_random_value(self):
-        return randomizer.get_random_datetime_value(
-            datetime.combine(date.today(), self.min_value),
-            datetime.combine(date.today(), self.max_value),
-        ).time()
+    @staticmethod
+    def _to_integer(value: time) -> int:
+        return (
+            (value.hour * 60 + value.minute) * 60 + value.second
+        ) * 10**6 + value.microsecond
+
+    def _compute_integer_range(self) -> tuple[int, int, int]:
+        """
+        First value, count of steps and step in microseconds of day
+        """
+        first = self._to_integer(self.min_value)
+        step = max(self.step // timedelta(microseconds=1), 1)
+        return first, (self._to_integer(self.max_value) - first) // step, step
+
+    def _from_integer(self, value: int) -> time:
+        seconds, microsecond = divmod(value, 10**6)
+        minutes, second = divmod(seconds, 60)
+        hour, minute = divmod(minutes, 60)
+        return time(hour, minute, second, microsecond, self.min_value.tzinfo)
 
     @classmethod
     def validate(cls, **kwargs):
@@ -426,7 +719,7 @@ class FieldStr(Field):
     min_length: int = 0
     str_format: dict | str | None = None
     null_allowed: bool = True
-    __available_str_formats = ("email", "email_simple")
+    __available_str_formats = ("email", "email_simple", "text")
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -438,23 +731,40 @@ class FieldStr(Field):
             self.min_length = {"email": 3, "email_simple": 3}.get(self.str_format, 0)
 
     def get_random_value(self, length=None):
+        if isinstance(self.str_format, dict):
+            sampler = get_regex_sampler(self.str_format["re"])
+            if length is not None:
+                return sampler.get_random_value(length, length)
+            if self.min_length or self.max_length is not None:
+                return sampler.get_random_value(self.min_length, self.max_length)
+            return sampler.get_random_value()
         length = (
             length
             if length is not None
-            else randint(self.min_length or 1, self.max_length or 100000)
+            else randomizer.get_size_profile().get_length(
+                self.min_length, self.max_length
+            )
         )
-        if isinstance(self.str_format, dict):
-            return rstr.xeger(self.str_format["re"])
-        elif self.str_format:
+        if self.str_format:
             fun = {
                 "email": randomizer.get_random_email_value,
                 "email_simple": randomizer.get_random_email_value,
+                "text": corpus.get_random_text,
             }[self.str_format]
             kwargs = {}
             if self.str_format == "email_simple":
                 kwargs = {"safe": True}
             return fun(length, **kwargs)
-        return randomizer.get_randname(length, "w")
+        return randomizer.get_random_string(length, "w")
+
+    def get_random_values(self, count: int, generator=None) -> list[str]:
+        if self.str_format not in ("email", "email_simple"):
+            return super().get_random_values(count)
+        profile = randomizer.get_size_profile()
+        return randomizer.get_random_email_values(
+            [profile.get_length(self.min_length, self.max_length) for _ in range(count)],
+            safe=self.str_format == "email_simple",
+        )
 
     @classmethod
     def validate(cls, **kwargs):
@@ -485,6 +795,7 @@ class FieldStr(Field):
                 if not str_format["re"]:
                     raise ValueError(f"Regexp in str_format can not be empty")
                 re.compile(str_format["re"])
+                get_regex_sampler(str_format["re"])
 
 
 class FieldUuid(Field):
@@ -492,7 +803,7 @@ class FieldUuid(Field):
     null_allowed: bool = True
 
     def get_random_value(self, *a, **k):
-        return uuid4()
+        return UUID(int=randomizer.get_random().getrandbits(128), version=4)
 
 
 class FieldSelect(Field):
@@ -501,7 +812,10 @@ class FieldSelect(Field):
 
     def get_random_value(self, *a, **k):
         # TODO
-        return choice(self.choice_values)
+        return randomizer.get_random().choice(self.choice_values)
+
+    def get_random_values(self, count: int, generator=None) -> list:
+        return randomizer.get_random().choices(self.choice_values, k=count)
 
 
 class FieldMultiselect(FieldSelect):
@@ -509,7 +823,11 @@ class FieldMultiselect(FieldSelect):
 
     def get_random_value(self, *a, **k):
         # TODO
-        return [choice(self.choice_values)]
+        return [randomizer.get_random().choice(self.choice_values)]
+
+    def get_random_values(self, count: int, generator=None) -> list[list]:
+        values = randomizer.get_random().choices(self.choice_values, k=count)
+        return [[value] for value in values]
 
 
 class FieldFile(Field):
@@ -521,6 +839,9 @@ class FieldFile(Field):
     max_size: int = 10 * 1024 * 1024  # 10M
     sum_max_size: int = 10 * 1024 * 1024  # 10M
     extensions: Iterable[str] = ()
+    _default_extension = "txt"
+    # Usual limit of file systems, used if max_length is not set
+    _max_filename_length = 255
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -528,6 +849,51 @@ class FieldFile(Field):
             if field in kwargs.keys():
                 kwargs[field] = convert_size_to_bytes(kwargs[field])
 
+    def get_random_value(self):
+        """
+        File (SpooledFile for file, PaddedFile for image), list of files if max_count > 1.
+        Sizes are chosen by size profile within max_size and sum_max_size
+        """
+        rng = randomizer.get_random()
+        count = min(rng.randint(1, self.max_count), self.sum_max_size)
+        extensions = tuple(self.extensions) or (self._default_extension,)
+        specs = []
+        for size in self._get_sizes(count):
+            extension = rng.choice(extensions).lstrip(".")
+            specs.append((self._get_filename(extension), extension, size))
+        files = self._make_files(specs)
+        return files if self.max_count > 1 else files[0]
+
+    def _get_sizes(self, count: int) -> list[int]:
+        profile = randomizer.get_size_profile()
+        remaining = self.sum_max_size
+        sizes = []
+        for left in range(count - 1, -1, -1):
+            size = profile.get_length(1, min(self.max_size, remaining - left))
+            sizes.append(size)
+            remaining -= size
+        return sizes
+
+    def _get_filename(self, extension: str) -> str:
+        min_length = max(1, self.min_length - len(extension) - 1)
+        max_length = max(
+            min_length, (self.max_length or self._max_filename_length) - len(extension) - 1
+        )
+        length = randomizer.get_size_profile().get_length(min_length, max_length)
+        return f"{randomizer.get_random_string(length, 'wd')}.{extension}"
+
+    def _make_files(self, specs: list[tuple[str, str, int]]) -> list:
+        """
+        Files for (filename, extension, size) specs
+        """
+        files = []
+        for filename, extension, size in specs:
+            f = randomizer.SpooledFile(filename)
+            randomizer.write_random_file_content(f, size)
+            f.seek(0)
+            files.append(f)
+        return files
+
     @classmethod
     def validate(cls, **kwargs):
         super().validate(**kwargs)
@@ -562,7 +928,46 @@ class FieldImage(FieldFile):
     min_height: int = 1
     max_width: int = 10000
     max_height: int = 10000
+    _default_extension = "png"
     __available_extensions = ('bmp', 'gif', 'jpg', 'jpeg', 'png', 'svg', 'tiff', 'webp')
+    # Generated images are not larger, if min_width and min_height allow
+    _max_generated_side = 1000
+
+    def _make_files(self, specs: list[tuple[str, str, int]]) -> list:
+        """
+        Images of random dimensions with virtual padding up to size, large ones are encoded in parallel.
+        Dimensions are reduced to fit size: BMP by its exact size, other formats
+        by estimate and then halved while encoded image is larger than size
+        """
+        rng = randomizer.get_random()
+        max_side = (
+            max(self.min_width, min(self.max_width, self._max_generated_side)),
+            max(self.min_height, min(self.max_height, self._max_generated_side)),
+        )
+        image_specs = []
+        for filename, extension, size in specs:
+            max_pixels = max(1, (size - 1000) // 3)
+            width = rng.randint(self.min_width, max_side[0])
+            width = max(self.min_width, min(width, max_pixels))
+            height = rng.randint(self.min_height, max_side[1])
+            height = max(self.min_height, min(height, max_pixels // width))
+            if randomizer.get_image_format(extension) == "BMP":
+                max_height = (size - encoders.BMP_HEADER_SIZE) // encoders.get_bmp_row_size(
+                    width
+                )
+                height = max(self.min_height, min(height, max_height))
+            image_specs.append((extension, size, width, height, filename))
+        files = images.get_padded_images(image_specs)
+        for i, (extension, size, width, height, filename) in enumerate(image_specs):
+            while files[i].size > size and (
+                width > self.min_width or height > self.min_height
+            ):
+                width = max(self.min_width, width // 2)
+                height = max(self.min_height, height // 2)
+                files[i] = images.get_padded_images(
+                    [(extension, size, width, height, filename)]
+                )[0]
+        return files
 
     @classmethod
     def validate(cls, **kwargs):
@@ -599,7 +1004,33 @@ class FieldBoolean(Field):
     not_empty: bool = True
 
     def get_random_value(self):
-        return choice((True, False))
+        return randomizer.get_random().choice((True, False))
+
+    def get_random_values(self, count: int, generator=None) -> list[bool]:
+        return randomizer.get_random().choices((True, False), k=count)
+
+
+class DataBatch(Sequence):
+    """
+    Generated payloads stored by columns: one list of values per field.
+    Item is a payload dict built on access
+    """
+
+    def __init__(self, columns: dict[str, list], count: int):
+        self.columns = columns
+        self.count = count
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError("DataBatch index out of range")
+        return {k: v[i] for k, v in self.columns.items()}
 
 
 class Form:
@@ -610,12 +1041,27 @@ class Form:
         min_count: int = 0
         name_format = "{field}"
         all_fields = None
+        size_profile = None
 
     def __getitem__(self, k, *a):
         return getattr(self, k)
 
+    def __getattr__(self, k):
+        """
+        Fields of lazy form are created on first access
+        """
+        definitions = self.__dict__.get("_definitions")
+        if not definitions or k not in definitions:
+            raise AttributeError(
+                f"'{self.__class__.__name__}' object has no attribute '{k}'"
+            )
+        field = self._make_field(k, definitions.pop(k))
+        setattr(self, k, field)
+        return field
+
     def __setitem__(self, k, v):
         self.Meta.all_fields.update((k,))
+        self.__dict__.pop("_compiled_conditions", None)
         setattr(self, k, v)
 
     @cached_property
@@ -630,56 +1076,355 @@ class Form:
         return data
 
     def __init__(self, **kwargs):
-        self.Meta.all_fields = set()
-        for field_name, data in kwargs.pop("fields").items():
-            field_class = self._field_classes_according_to_form_type.get(
-                data["type"], Field
-            )
-            data["name"] = field_name
-            self[field_name] = field_class(**data)
+        self.Meta = type("Meta", (self.Meta,), {"all_fields": set()})
+        self._field_cache = kwargs.pop("field_cache", None)
+        self._trusted = kwargs.pop("trusted", False)
+        self._trusted_sample_rate = kwargs.pop("trusted_sample_rate", 0)
+        self._conditions = {}
+        self._seed = kwargs.pop("seed", None)
+        self._cases = itertools.count()
+        self._pools = {}
+        self._unique_values = {}
+        if kwargs.pop("lazy", False):
+            self._definitions = dict(kwargs.pop("fields"))
+            self.Meta.all_fields.update(self._definitions.keys())
+        for field_name, data in kwargs.pop("fields", {}).items():
+            self[field_name] = self._make_field(field_name, data)
         for k, v in kwargs.items():
             setattr(self.Meta, k, v)
 
+    def _make_field(self, field_name: str, data: dict) -> Field:
+        """
+        With field_cache structurally identical definitions share one frozen field
+        """
+        field_class = self._field_classes_according_to_form_type.get(
+            data["type"], Field
+        )
+        data["name"] = field_name
+        key = (field_class, get_definition_key(data))
+        if self._field_cache is not None and key in self._field_cache:
+            return self._field_cache[key]
+        field = self._build_field(field_class, key, data)
+        if self._field_cache is not None:
+            field = self._field_cache[key] = field.freeze()
+        return field
+
+    def _build_field(self, field_class, key, data: dict) -> Field:
+        """
+        Definitions validated before and all definitions of trusted form are not validated.
+        For trusted form part of definitions (trusted_sample_rate) is still checked in debug mode
+        """
+        if not self._trusted and key not in validated_definitions:
+            field = field_class(**data)
+            validated_definitions.add(key)
+            return field
+        if __debug__ and self._trusted and random() < self._trusted_sample_rate:
+            try:
+                field = field_class(**data)
+            except Exception as e:
+                raise AssertionError(
+                    f'Trusted definition of field "{data["name"]}" is not valid: {e}'
+                ) from e
+            validated_definitions.add(key)
+            return field
+        return field_class.trusted(**data)
+
     def get_all_fields(self) -> Iterator[str]:
         return self.Meta.all_fields
 
+    def get_condition(self, name: str, kind: str):
+        """
+        required, not_empty, only or unique of field.
+        For not created field of lazy form it is parsed from definition without creating field
+        """
+        if name in self.__dict__.get("_definitions", ()):
+            if name not in self._conditions:
+                data = self._definitions[name]
+                field_class = self._field_classes_according_to_form_type.get(
+                    data["type"], Field
+                )
+                self._conditions[name] = field_class.pop_conditions(dict(data))
+            return self._conditions[name][kind]
+        return getattr(self[name], kind)
+
+    @cached_property
+    def _compiled_conditions(self) -> dict[str, dict[str, Callable[[Mapping], bool]]]:
+        """
+        Predicates of required, not_empty and only conditions of fields, built once per form
+        """
+        result = {}
+        for name in self.get_all_fields():
+            result[name] = {}
+            for kind in ("required", "not_empty", "only"):
+                if condition := self.get_condition(name, kind):
+                    result[name][kind] = condition.compile()
+        return result
+
+    def get_predicate(self, name: str, kind: str) -> Callable[[Mapping], bool] | None:
+        """
+        Compiled required, not_empty or only condition of field, None if there is no condition
+        """
+        return self._compiled_conditions[name].get(kind)
+
+    def get_payload_errors(self, payload: Mapping) -> dict[str, str]:
+        """
+        Fields of payload which break form conditions: not filled required field,
+        empty not_empty field or filled field which only condition is not met
+        """
+        errors = {}
+        for name, predicates in self._compiled_conditions.items():
+            filled = is_filled(payload, name)
+            if not filled and (required := predicates.get("required")) and required(payload):
+                errors[name] = "required"
+            elif (
+                name in payload
+                and not filled
+                and (not_empty := predicates.get("not_empty"))
+                and not_empty(payload)
+            ):
+                errors[name] = "not_empty"
+            elif filled and (only := predicates.get("only")) and not only(payload):
+                errors[name] = "only"
+        return errors
+
     def get_one_of_fields(self):
         """
         Groups of fields which cannot be filled together
         """
-        all_fields_names = self.get_all_fields()
         result = {}
-        for name in all_fields_names:
-            field = self[name]
-            _result = []
-            if field.only and field.only.cases:
-                for data in field.only.cases:
-                    one_group_fields = []
-                    for k, v in data.items():
-                        if not v:
-                            one_group_fields.append(k)
-                    if one_group_fields:
-                        _result.append(one_group_fields)
-            result[name] = _result
+        for name in self.get_all_fields():
+            only = self.get_condition(name, "only")
+            result[name] = [
+                list(not_filled)
+                for not_filled, _ in (only.compiled_cases if only else ())
+                if not_filled
+            ]
         return result
 
     def get_required_fields(self) -> Iterator[str]:
         # FIXME: for related fields
-        all_fields_names = self.get_all_fields()
-        result = []
-        for name in all_fields_names:
-            if self[name].required:
-                result.append(name)
-        return result
+        return [
+            name
+            for name, predicates in self._compiled_conditions.items()
+            if "required" in predicates
+        ]
+
+    def use_pool(self, field_name: str, **kwargs) -> ValuePool:
+        """
+        Take values of field from pool pre-generated in background thread (see ValuePool).
+        Pool values do not depend on form seed, they use size profile of form
+        """
+        self.close_pools((field_name,))
+        field = self[field_name]
+
+        def generate():
+            with randomizer.use_size_profile(self.Meta.size_profile):
+                return field.get_random_value()
+
+        self._pools[field_name] = ValuePool(generate, **kwargs)
+        return self._pools[field_name]
+
+    def close_pools(self, fields: Iterable[str] | None = None) -> None:
+        for field_name in list(self._pools) if fields is None else fields:
+            if (pool := self._pools.pop(field_name, None)) is not None:
+                pool.close()
+
+    def get_random_stream(self, field_name: str, case: int) -> Random:
+        """
+        Independent random generator of field for case of form with seed
+        """
+        return Random(randomizer.get_stream_seed(self._seed, field_name, case))
+
+    def _get_case(self, case: int | None) -> int | None:
+        if self._seed is None:
+            return None
+        return next(self._cases) if case is None else case
+
+    def get_unique_key(self, field_name: str, data: dict) -> Hashable | None:
+        """
+        Key of field value in payload for uniqueness check, None if field is not unique.
+        Values of with fields are part of key, strings are compared casefolded if not case_sensitive
+        """
+        if not (unique := self.get_condition(field_name, "unique")):
+            return None
+        value = data[field_name]
+        if not unique.case_sensitive and isinstance(value, str):
+            value = value.casefold()
+        return get_definition_key(
+            (value, *(data.get(name) for name in unique.with_fields))
+        )
+
+    def clear_unique_values(self, fields: Iterable[str] | None = None) -> None:
+        """
+        Forget generated values of unique fields, e.g. after objects are removed
+        """
+        for field_name in list(self._unique_values) if fields is None else fields:
+            self._unique_values.pop(field_name, None)
+
+    @contextmanager
+    def unique_scope(self):
+        """
+        Values of unique fields generated inside the block are unique only among themselves
+        and are forgotten after it, e.g. for form shared by several tests
+        """
+        unique_values, self._unique_values = self._unique_values, {}
+        try:
+            yield self
+        finally:
+            self._unique_values = unique_values
+
+    def _make_unique(self, data: dict, fields: Iterable[str], generate) -> None:
+        """
+        Regenerate values of unique fields which were already generated by this form.
+        If there is no new value in UNIQUE_ATTEMPTS attempts, the last one is kept
+        """
+        for field_name in fields:
+            if (key := self.get_unique_key(field_name, data)) is None:
+                continue
+            index = self._unique_values.setdefault(field_name, UniqueIndex())
+            for _ in range(UNIQUE_ATTEMPTS):
+                if index.add(key):
+                    break
+                data[field_name] = generate(field_name)
+                key = self.get_unique_key(field_name, data)
+            else:
+                warnings.warn(
+                    f'Can not generate unique value of field "{field_name}" '
+                    f"in {UNIQUE_ATTEMPTS} attempts, repeated value is used"
+                )
+
+    def _get_random_value(self, field_name: str, rng: Random | None = None):
+        if (pool := self._pools.get(field_name)) is not None:
+            return pool.pop()
+        if rng is None:
+            return self[field_name].get_random_value()
+        with randomizer.use_random(rng):
+            return self[field_name].get_random_value()
+
+    def _get_related_sampler(
+        self, fields: list[str], additional: dict
+    ) -> RelatedSampler | None:
+        generated = [f for f in fields if f not in additional and f not in self._pools]
+        return RelatedSampler.get_for_form(
+            self, generated, set(fields).union(additional)
+        )
+
+    def _regenerate_value(
+        self, field_name: str, data: dict, related: RelatedSampler | None, rng
+    ):
+        if related is not None and field_name in related.fields:
+            return related.resample(field_name, data, rng or randomizer.get_random())
+        return self._get_random_value(field_name, rng)
 
     def get_random_data(
-        self, fields: Iterable[str] | None = None, additional: dict | None = None
+        self,
+        fields: Iterable[str] | None = None,
+        additional: dict | None = None,
+        case: int | None = None,
     ) -> dict:
+        """
+        With form seed each field is generated by own random stream of case,
+        so result for the same seed and case does not depend on other fields and calls.
+        Without case the cases are numbered by calls.
+        Fields bound by lt/lte are generated consistent with each other and additional values.
+        Values of unique fields which repeat earlier generated ones are regenerated
+        """
         if fields is None:
             fields = self.get_required_fields()
-        data = {f: self[f].get_random_value() for f in fields}
-        data.update(additional or {})
+        fields = list(fields)
+        additional = additional or {}
+        case = self._get_case(case)
+        streams = {}
+        if case is not None:
+            streams = {f: self.get_random_stream(f, case) for f in fields}
+        related = self._get_related_sampler(fields, additional)
+        data = {}
+        with randomizer.use_size_profile(self.Meta.size_profile):
+            for f in fields:
+                if related is None or f not in related.fields:
+                    data[f] = self._get_random_value(f, streams.get(f))
+            data.update(additional)
+            if related is not None:
+                related.sample(
+                    data, lambda f: streams.get(f) or randomizer.get_random()
+                )
+            self._make_unique(
+                data,
+                [f for f in fields if f not in additional],
+                lambda f: self._regenerate_value(f, data, related, streams.get(f)),
+            )
         return data
 
+    def get_random_data_batch(
+        self,
+        count: int,
+        fields: Iterable[str] | None = None,
+        additional: dict | None = None,
+        backend: str = "python",
+        case: int | None = None,
+    ) -> DataBatch:
+        """
+        count payloads like get_random_data, each field column is generated in one call.
+        With backend "numpy" numeric and temporal columns are generated by NumPy
+        """
+        if fields is None:
+            fields = self.get_required_fields()
+        fields = list(fields)
+        additional = additional or {}
+        if backend not in ("python", "numpy"):
+            raise ValueError(
+                f'Unknown backend "{backend}". Available backends: python, numpy'
+            )
+        case = self._get_case(case)
+        related = self._get_related_sampler(fields, additional)
+        columns = {}
+        streams = {}
+        for f in fields:
+            if (pool := self._pools.get(f)) is not None:
+                columns[f] = pool.pop_many(count)
+                continue
+            seed = None
+            rng = randomizer.get_random()
+            if case is not None:
+                seed = randomizer.get_stream_seed(self._seed, f, case)
+                rng = streams[f] = Random(seed)
+            kwargs = {}
+            if backend == "numpy":
+                kwargs["generator"] = vectorized.get_generator(seed)
+            if related is not None and f in related.fields:
+                streams[f] = rng
+                continue
+            with randomizer.use_random(rng), randomizer.use_size_profile(
+                self.Meta.size_profile
+            ):
+                columns[f] = self[f].get_random_values(count, **kwargs)
+        columns.update({k: [v] * count for k, v in additional.items()})
+        if related is not None:
+            for f in related.fields:
+                columns[f] = [None] * count
+        batch = DataBatch(columns, count)
+        unique_fields = [
+            f
+            for f in fields
+            if f not in additional and self.get_condition(f, "unique")
+        ]
+        if related is None and not unique_fields:
+            return batch
+        changed = set(unique_fields).union(related.fields if related else ())
+        with randomizer.use_size_profile(self.Meta.size_profile):
+            for i, data in enumerate(batch):
+                if related is not None:
+                    related.sample(
+                        data, lambda f: streams.get(f) or randomizer.get_random()
+                    )
+                self._make_unique(
+                    data,
+                    unique_fields,
+                    lambda f: self._regenerate_value(f, data, related, streams.get(f)),
+                )
+                for f in changed:
+                    columns[f][i] = data[f]
+        return batch
+
     def set_empty_value(self, params: dict, field: str) -> None:
         params[field] = ''
@@ -1,5 +1,5 @@
 from datetime import date, datetime
-from .common import Form as BaseForm
+from .common import DataBatch, Form as BaseForm
 
 
 def to_json(value):
@@ -14,3 +14,10 @@ class Form(BaseForm):
     def get_random_data(self, *args, **kwargs) -> dict:
         params = super().get_random_data(*args, **kwargs)
         return to_json(params)
+
+    def get_random_data_batch(self, *args, **kwargs) -> DataBatch:
+        batch = super().get_random_data_batch(*args, **kwargs)
+        batch.columns = {
+            k: [to_json(v) for v in column] for k, column in batch.columns.items()
+        }
+        return batch
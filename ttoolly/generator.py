@@ -34,9 +34,16 @@ class TestCaseMeta(type):
     def param_as_standalone_func(cls, func, name, **kwargs):
         """from parameterize.parameterized"""
 
+        form = kwargs.get("form")
+
         @wraps(func)
         def standalone_func(self, *a, **k):
-            return func(self, *a, **k, **kwargs)
+            if form is None:
+                return func(self, *a, **k, **kwargs)
+            # objects of one test are not kept for other tests,
+            # so values of unique fields are unique only inside test
+            with form.unique_scope():
+                return func(self, *a, **k, **kwargs)
 
         standalone_func.__name__ = name
 
@@ -78,7 +78,7 @@ class TestHandler:
         other_required_fields = []
 
         for name in all_fields_names:
-            if required := self.form[name].required:
+            if required := self.form.get_condition(name, "required"):
                 if required.cases:
                     required_with_case.append(name)
                 elif required.filled:
@@ -90,7 +90,7 @@ class TestHandler:
         )
         result = {}
         for name in other_required_fields:
-            required = self.form[name].required
+            required = self.form.get_condition(name, "required")
             result[
                 tuple(
                     sorted(set(all_required_fields).difference([name, required.filled]))
@@ -98,14 +98,13 @@ class TestHandler:
             ] = {}
 
         for name in required_with_case:
-            for required_case in self.form[name].required.cases:
-                new_fields_list = set(all_required_fields).difference(
-                    [k for k, v in required_case.items() if not v]
-                )
+            required = self.form.get_condition(name, "required")
+            for not_filled, values in required.compiled_cases:
+                new_fields_list = set(all_required_fields).difference(not_filled)
                 if set(all_required_fields).difference(new_fields_list):
                     result[tuple(sorted(new_fields_list))] = {}
 
-                if additional_data := {k: v for k, v in required_case.items() if v}:
+                if additional_data := dict(values):
                     result[
                         tuple(
                             sorted(
@@ -0,0 +1,113 @@
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+
+UNIQUE_ATTEMPTS = 100
+
+
+class ValuePool:
+    """
+    Bounded buffer of pre-generated values, refilled by background thread.
+    Values are given out in order of generation. With unique each value is given out once,
+    with max_age values older than max_age seconds are evicted
+    """
+
+    def __init__(
+        self,
+        generate: Callable,
+        size: int = 100,
+        unique: bool = False,
+        max_age: float | None = None,
+        key: Callable | None = None,
+    ):
+        if size < 1:
+            raise ValueError(f"Pool size ({size}) can not be less than 1")
+        self.generate = generate
+        self.size = size
+        self.unique = unique
+        self.max_age = max_age
+        self.key = key or (lambda value: value)
+        self._values = deque()
+        self._seen = set()
+        self._condition = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._refill, daemon=True)
+        self._thread.start()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _new_value(self):
+        for _ in range(UNIQUE_ATTEMPTS):
+            value = self.generate()
+            if not self.unique:
+                return value
+            key = self.key(value)
+            with self._condition:
+                if key not in self._seen:
+                    self._seen.add(key)
+                    return value
+        raise ValueError(f"Can not generate unique value in {UNIQUE_ATTEMPTS} attempts")
+
+    def _refill(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or len(self._values) < self.size
+                )
+                if self._closed:
+                    return
+            try:
+                value = self._new_value()
+            except Exception:
+                # values will be generated on pop and error will be raised there
+                self.close(wait=False)
+                return
+            with self._condition:
+                self._values.append((time.monotonic(), value))
+                self._condition.notify_all()
+
+    def _evict(self):
+        if self.max_age is None:
+            return
+        min_time = time.monotonic() - self.max_age
+        while self._values and self._values[0][0] < min_time:
+            self._values.popleft()
+
+    def pop(self):
+        """
+        Value from pool, if pool is empty it is generated immediately
+        """
+        with self._condition:
+            self._evict()
+            if self._values:
+                _, value = self._values.popleft()
+                self._condition.notify_all()
+                return value
+        return self._new_value()
+
+    def pop_many(self, count: int) -> list:
+        return [self.pop() for _ in range(count)]
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """
+        Wait until pool is full
+        """
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self._closed or len(self._values) >= self.size, timeout
+            )
+
+    def close(self, wait: bool = True):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if wait and self._thread is not threading.current_thread():
+            self._thread.join()
@@ -0,0 +1,132 @@
+import math
+from collections.abc import Callable, Iterable
+from fractions import Fraction
+from graphlib import CycleError, TopologicalSorter
+from random import Random
+
+
+def get_relations(form, fields: Iterable[str]) -> list[tuple[str, str, bool]]:
+    """
+    (less, greater, strict) for each lt/lte relation between given fields
+    """
+    fields = set(fields)
+    result = []
+    for name in fields:
+        for kind, strict in (("lt", True), ("lte", False)):
+            others = getattr(form[name], kind, None) or []
+            if isinstance(others, str):
+                others = [others]
+            result.extend((name, other, strict) for other in others if other in fields)
+    return result
+
+
+class RelatedSampler:
+    """
+    Values of fields bound by lt/lte relations, generated in one pass without retries.
+    Fields are sampled in topological order. Upper bound of each field is narrowed in advance
+    so that all greater fields still have a valid value, lower bound is taken from values
+    chosen before. Values of fields which are not sampled (additional, pools) are fixed
+    """
+
+    def __init__(self, form, fields: Iterable[str], relations: list[tuple[str, str, bool]]):
+        self.form = form
+        self.fields = set(fields)
+        self.greater = {}
+        self.less = {}
+        graph = {}
+        for less, greater, strict in relations:
+            self.greater.setdefault(less, []).append((greater, strict))
+            self.less.setdefault(greater, []).append((less, strict))
+            graph.setdefault(greater, set()).add(less)
+            graph.setdefault(less, set())
+        try:
+            self.order = list(TopologicalSorter(graph).static_order())
+        except CycleError as e:
+            raise ValueError(f"Fields lt/lte relations are cyclic: {e.args[1]}") from e
+        self.order = [name for name in self.order if name in self.fields]
+
+    @classmethod
+    def get_for_form(cls, form, fields: Iterable[str], known: Iterable[str]):
+        """
+        Sampler for fields related to any of known fields, None if there are no such fields
+        """
+        fields = {
+            name for name in fields if hasattr(form[name], "_get_integer_range")
+        }
+        relations = [
+            relation
+            for relation in get_relations(
+                form, set(known).intersection(form.get_all_fields())
+            )
+            if set(relation[:2]) & fields
+            and all(
+                hasattr(form[name], "_get_integer_range") for name in relation[:2]
+            )
+        ]
+        related = {name for relation in relations for name in relation[:2]}
+        if not related & fields:
+            return None
+        return cls(form, related & fields, relations)
+
+    def _get_index(self, name: str, value, strict: bool, upper: bool) -> int:
+        """
+        Index of step of field closest to value: the last one which is less (or equal)
+        for upper bound, the first one which is greater (or equal) for lower bound
+        """
+        field = self.form[name]
+        first, _, step = field._get_integer_range()
+        position = (Fraction(field._to_integer(value)) - first) / step
+        if upper:
+            return math.ceil(position) - 1 if strict else math.floor(position)
+        return math.floor(position) + 1 if strict else math.ceil(position)
+
+    def _get_value(self, name: str, index: int):
+        first, _, step = self.form[name]._get_integer_range()
+        return self.form[name]._from_integer(first + index * step)
+
+    def _get_upper_indexes(self, data: dict) -> dict[str, int]:
+        result = {}
+        for name in reversed(self.order):
+            upper = self.form[name]._get_integer_range()[1]
+            for greater, strict in self.greater.get(name, ()):
+                if greater in self.fields:
+                    value = self._get_value(greater, result[greater])
+                elif (value := data[greater]) in (None, ""):
+                    continue
+                upper = min(upper, self._get_index(name, value, strict, True))
+            result[name] = upper
+        return result
+
+    def _get_lower_index(self, name: str, data: dict) -> int:
+        lower = 0
+        for less, strict in self.less.get(name, ()):
+            if data[less] not in (None, ""):
+                lower = max(lower, self._get_index(name, data[less], strict, False))
+        return lower
+
+    def _choose(self, name: str, lower: int, upper: int, rng: Random):
+        if lower > upper:
+            raise ValueError(
+                f'Can not generate value of field "{name}" satisfying lt/lte relations'
+            )
+        return self._get_value(name, rng.randint(lower, upper))
+
+    def sample(self, data: dict, get_random: Callable[[str], Random]) -> dict:
+        """
+        Add values of sampled fields to data with values of fixed fields
+        """
+        upper_indexes = self._get_upper_indexes(data)
+        for name in self.order:
+            lower = self._get_lower_index(name, data)
+            data[name] = self._choose(name, lower, upper_indexes[name], get_random(name))
+        return data
+
+    def resample(self, name: str, data: dict, rng: Random):
+        """
+        New value of one field between current values of related fields
+        """
+        upper = self.form[name]._get_integer_range()[1]
+        for greater, strict in self.greater.get(name, ()):
+            if data[greater] not in (None, ""):
+                upper = min(upper, self._get_index(name, data[greater], strict, True))
+        return self._choose(name, self._get_lower_index(name, data), upper, rng)
@@ -0,0 +1,84 @@
+import hashlib
+import math
+import threading
+from collections.abc import Hashable
+
+EXACT_LIMIT = 100_000
+BLOOM_CAPACITY = 1_000_000
+BLOOM_ERROR_RATE = 0.001
+
+
+class BloomFilter:
+    """
+    Set of keys with fixed memory size. Can answer that key is present when it is not
+    (with probability about error_rate until capacity keys are added), never the other way
+    """
+
+    def __init__(self, capacity: int = BLOOM_CAPACITY, error_rate: float = BLOOM_ERROR_RATE):
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _get_positions(self, key: Hashable):
+        digest = hashlib.blake2b(repr(key).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return ((first + i * second) % self.size for i in range(self.hashes_count))
+
+    def add(self, key: Hashable) -> None:
+        for position in self._get_positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._get_positions(key)
+        )
+
+
+class UniqueIndex:
+    """
+    Keys of already generated values. First exact_limit keys are kept in set,
+    next ones in bloom filter, so memory is bounded and collision is never missed.
+    Keys are checked and added atomically, so index can be shared by threads
+    """
+
+    def __init__(self, exact_limit: int = EXACT_LIMIT, **bloom_kwargs):
+        self.exact_limit = exact_limit
+        self._bloom_kwargs = bloom_kwargs
+        self._exact = set()
+        self._bloom = None
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            return self._contains(key)
+
+    def _contains(self, key: Hashable) -> bool:
+        return key in self._exact or (self._bloom is not None and key in self._bloom)
+
+    def add(self, key: Hashable) -> bool:
+        """
+        Add key, False if it (probably) was added before
+        """
+        with self._lock:
+            if self._contains(key):
+                return False
+            if len(self._exact) < self.exact_limit:
+                self._exact.add(key)
+            else:
+                if self._bloom is None:
+                    self._bloom = BloomFilter(**self._bloom_kwargs)
+                self._bloom.add(key)
+            self._count += 1
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._exact.clear()
+            self._bloom = None
+            self._count = 0
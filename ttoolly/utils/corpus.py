@@ -0,0 +1,87 @@
+import mmap
+import os
+import re
+from array import array
+from functools import lru_cache
+
+from ttoolly.utils import randomizer
+
+WORDS_PATH = os.environ.get(
+    "TTOOLLY_WORDS_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "words.txt"),
+)
+MIN_SENTENCE_WORDS = 4
+MAX_SENTENCE_WORDS = 12
+
+
+class WordCorpus:
+    """
+    Words of file (one per line) memory-mapped read-only, so the file is read once
+    and its pages are shared by processes. Only offsets of words are kept in memory
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._content = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._starts = array("Q")
+        self._ends = array("Q")
+        for match in re.finditer(rb"[^\r\n]+", self._content):
+            if match.group().strip():
+                self._starts.append(match.start())
+                self._ends.append(match.end())
+        if not self._starts:
+            raise ValueError(f'Words corpus "{path}" is empty')
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __getitem__(self, index: int) -> str:
+        return self._content[self._starts[index] : self._ends[index]].decode().strip()
+
+    def get_random_text(self, length: int) -> str:
+        """
+        Sentences of random words with exactly length characters.
+        The last word is cut if it does not fit
+        """
+        rng = randomizer.get_random()
+        parts = []
+        remaining = length
+        sentence_words = 0
+        while remaining > 0:
+            word = self[rng.randrange(len(self))]
+            if not sentence_words:
+                word = word.capitalize()
+                sentence_words = rng.randint(MIN_SENTENCE_WORDS, MAX_SENTENCE_WORDS)
+            sentence_words -= 1
+            if not sentence_words:
+                word += "."
+            if len(word) >= remaining:
+                parts.append(word[:remaining])
+                break
+            # text can not end with space, so one character left ends or continues sentence
+            if remaining - len(word) == 1:
+                if word.endswith("."):
+                    word = word[:-1]
+                    sentence_words = 1
+                else:
+                    word += "."
+                    sentence_words = 0
+            parts.append(word)
+            remaining -= len(word)
+            if remaining:
+                parts.append(" ")
+                remaining -= 1
+        return "".join(parts)
+
+
+@lru_cache
+def get_corpus(path: str | None = None) -> WordCorpus:
+    """
+    Corpus of file at path, TTOOLLY_WORDS_PATH or bundled english words by default
+    """
+    return WordCorpus(path or WORDS_PATH)
+
+
+def get_random_text(length: int, path: str | None = None) -> str:
+    return get_corpus(path).get_random_text(length)
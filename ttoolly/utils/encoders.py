@@ -0,0 +1,136 @@
+import struct
+import zlib
+
+# GIF LZW codes for 2 colors: code 0 is a pixel, codes from 6 are runs of 2, 3, ... pixels
+GIF_MIN_CODE_SIZE = 2
+GIF_CLEAR_CODE = 4
+GIF_END_CODE = 5
+GIF_MAX_CODE = 4096
+BMP_HEADER_SIZE = 54
+
+
+def get_bmp_row_size(width: int) -> int:
+    """
+    Bytes of BMP pixels row, rows are padded to 4 bytes
+    """
+    return (3 * width + 3) // 4 * 4
+
+
+def encode_bmp(width: int, height: int, color: tuple[int, int, int]) -> bytes:
+    """
+    24-bit uncompressed BMP filled with color (r, g, b)
+    """
+    red, green, blue = color
+    row = bytes((blue, green, red)) * width
+    row += bytes(get_bmp_row_size(width) - len(row))
+    data_size = len(row) * height
+    header = struct.pack(
+        "<2sIHHIIiiHHIIiiII",
+        b"BM",
+        BMP_HEADER_SIZE + data_size,
+        0,
+        0,
+        BMP_HEADER_SIZE,
+        40,
+        width,
+        height,
+        1,
+        24,
+        0,
+        data_size,
+        2835,
+        2835,
+        0,
+        0,
+    )
+    return header + row * height
+
+
+def _get_png_chunk(_type: bytes, data: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(data))
+        + _type
+        + data
+        + struct.pack(">I", zlib.crc32(_type + data))
+    )
+
+
+def encode_png(width: int, height: int, color: tuple[int, int, int]) -> bytes:
+    """
+    8-bit RGB PNG filled with color (r, g, b)
+    """
+    row = b"\0" + bytes(color) * width
+    compressor = zlib.compressobj(1)
+    # rows are compressed in batches, so memory does not depend on height
+    rows_per_batch = max(1, 2**20 // len(row))
+    data = []
+    for start in range(0, height, rows_per_batch):
+        data.append(compressor.compress(row * min(rows_per_batch, height - start)))
+    data.append(compressor.flush())
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            _get_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+            _get_png_chunk(b"IDAT", b"".join(data)),
+            _get_png_chunk(b"IEND", b""),
+        )
+    )
+
+
+def _get_gif_codes(pixels_count: int):
+    """
+    LZW codes with their bit lengths for pixels_count pixels of color 0.
+    Each code is a run one pixel longer than previous, so there are about sqrt(2 * pixels_count)
+    codes. Dictionary is cleared when it is full
+    """
+    code_size = GIF_MIN_CODE_SIZE + 1
+    yield GIF_CLEAR_CODE, code_size
+    next_code = GIF_END_CODE + 1
+    run = 1
+    while pixels_count:
+        run = min(run, pixels_count)
+        pixels_count -= run
+        yield (0 if run == 1 else GIF_END_CODE - 1 + run), code_size
+        if next_code >= 1 << code_size and code_size < 12:
+            code_size += 1
+        if not pixels_count:
+            break
+        if next_code < GIF_MAX_CODE:
+            next_code += 1
+            run += 1
+        else:
+            yield GIF_CLEAR_CODE, code_size
+            code_size = GIF_MIN_CODE_SIZE + 1
+            next_code = GIF_END_CODE + 1
+            run = 1
+    yield GIF_END_CODE, code_size
+
+
+def encode_gif(width: int, height: int, color: tuple[int, int, int]) -> bytes:
+    """
+    GIF with 2 colors palette filled with color (r, g, b)
+    """
+    bits = 0
+    bits_count = 0
+    for code, code_size in _get_gif_codes(width * height):
+        bits |= code << bits_count
+        bits_count += code_size
+    data = bits.to_bytes((bits_count + 7) // 8, "little")
+    blocks = b"".join(
+        bytes((len(data[i : i + 255]),)) + data[i : i + 255]
+        for i in range(0, len(data), 255)
+    )
+    return b"".join(
+        (
+            b"GIF89a",
+            struct.pack("<HHBBB", width, height, 0x80, 0, 0),
+            bytes(color) + b"\0\0\0",
+            struct.pack("<BHHHHB", 0x2C, 0, 0, width, height, 0),
+            bytes((GIF_MIN_CODE_SIZE,)),
+            blocks,
+            b"\0;",
+        )
+    )
+
+
+ENCODERS = {"BMP": encode_bmp, "GIF": encode_gif, "PNG": encode_png}
@@ -0,0 +1,259 @@
+import atexit
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from ttoolly.utils import randomizer
+from ttoolly.utils.utils import convert_size_to_bytes
+
+IMAGE_CACHE_MEMORY = 64 * 1024 * 1024
+IMAGE_CACHE_DIR = os.environ.get("TTOOLLY_IMAGE_CACHE_DIR")
+# Random images get seeds from this small set, so repeated format and dimensions are cached
+IMAGE_SEEDS = 16
+# Only formats encoded much slower than their content is sent back from pool
+# (WEBP is about 57 ms per megapixel, BMP, GIF, PNG, JPEG and TIFF are few ms or less)
+PARALLEL_FORMATS = frozenset({"WEBP"})
+# Smaller images are encoded in current process, pool start takes about 110 ms
+PARALLEL_MIN_PIXELS = 2_000_000
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+
+class ImageCache:
+    """
+    Generated image contents addressed by format, dimensions, size and seed.
+    Contents are kept in memory up to max_memory bytes, least recently used are evicted first.
+    With path contents are also stored in files there, content read from file
+    is kept in memory like generated one
+    """
+
+    def __init__(self, max_memory: int = IMAGE_CACHE_MEMORY, path: str | None = None):
+        self.max_memory = max_memory
+        self.path = path
+        self._contents = OrderedDict()
+        self._memory = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._contents)
+
+    @staticmethod
+    def get_key(_format: str, size, width: int, height: int, seed: int) -> str:
+        key = (_format.upper(), width, height, convert_size_to_bytes(size), seed)
+        return hashlib.sha256(repr(key).encode()).hexdigest()
+
+    def get(
+        self, _format: str, size=10, width: int = 1, height: int = 1, seed: int = 0
+    ) -> memoryview:
+        """
+        Read-only content of image, it is generated only if it is not cached
+        """
+        if (content := self.find(_format, size, width, height, seed)) is not None:
+            return content
+        if _format.upper() == "SVG":
+            content = randomizer.get_random_svg_content(size, width, height, seed)
+        else:
+            content = randomizer.get_random_img_content(
+                _format, size, width, height, seed
+            )
+        return self.add(_format, size, width, height, seed, content)
+
+    def find(
+        self, _format: str, size=10, width: int = 1, height: int = 1, seed: int = 0
+    ) -> memoryview | None:
+        """
+        Read-only content of image if it is cached
+        """
+        key = self.get_key(_format, size, width, height, seed)
+        with self._lock:
+            if (content := self._contents.get(key)) is not None:
+                self._contents.move_to_end(key)
+                return memoryview(content)
+        if self.path:
+            filename = self._get_filename(key, _format)
+            if os.path.exists(filename):
+                with open(filename, "rb") as f:
+                    content = f.read()
+                self._remember(key, content)
+                return memoryview(content)
+        return None
+
+    def add(
+        self, _format: str, size, width: int, height: int, seed: int, content: bytes
+    ) -> memoryview:
+        """
+        Cache content generated for these arguments, e.g. in process pool
+        """
+        key = self.get_key(_format, size, width, height, seed)
+        content = bytes(content)
+        if self.path:
+            self._store(self._get_filename(key, _format), content)
+        self._remember(key, content)
+        return memoryview(content)
+
+    def _get_filename(self, key: str, _format: str) -> str:
+        return os.path.join(self.path, f"{key}.{_format.lower()}")
+
+    def _store(self, filename: str, content: bytes) -> None:
+        """
+        Write file atomically, so parallel processes never read partial content
+        """
+        os.makedirs(self.path, exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(dir=self.path)
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_filename, filename)
+
+    def _remember(self, key: str, content: bytes) -> None:
+        if len(content) > self.max_memory:
+            return
+        with self._lock:
+            if key in self._contents:
+                return
+            self._contents[key] = content
+            self._memory += len(content)
+            while self._memory > self.max_memory:
+                _, evicted = self._contents.popitem(last=False)
+                self._memory -= len(evicted)
+
+    def clear(self) -> None:
+        """
+        Forget contents in memory, files are kept
+        """
+        with self._lock:
+            self._contents.clear()
+            self._memory = 0
+
+
+image_cache = ImageCache(path=IMAGE_CACHE_DIR)
+
+
+def _get_executor(max_workers: int | None):
+    """
+    Pool processes are not forked from current process, as fork is unsafe
+    while other threads (e.g. value pools) are running
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    methods = multiprocessing.get_all_start_methods()
+    method = "forkserver" if "forkserver" in methods else "spawn"
+    with _executors_lock:
+        if max_workers not in _executors:
+            _executors[max_workers] = ProcessPoolExecutor(
+                max_workers, mp_context=multiprocessing.get_context(method)
+            )
+        return _executors[max_workers]
+
+
+@atexit.register
+def _shutdown_executors() -> None:
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown()
+        _executors.clear()
+
+
+def _encode_image(spec: tuple[str, int, int, int]) -> bytes:
+    _format, width, height, seed = spec
+    if _format == "SVG":
+        return randomizer.get_random_svg_content(0, width, height, seed)
+    return randomizer.get_random_img_content(_format, 0, width, height, seed)
+
+
+def encode_images(
+    specs: Iterable[tuple[str, int, int, int]], max_workers: int | None = None
+) -> list[bytes]:
+    """
+    Contents of images (format, width, height, seed) in order of specs.
+    Several large images of PARALLEL_FORMATS are encoded in process pool,
+    other ones in current process meanwhile
+    """
+    specs = list(specs)
+    parallel = [i for i, spec in enumerate(specs) if spec[0] in PARALLEL_FORMATS]
+    if (
+        (max_workers or os.cpu_count() or 1) == 1
+        or len(parallel) < 2
+        or sum(specs[i][1] * specs[i][2] for i in parallel) < PARALLEL_MIN_PIXELS
+    ):
+        return [_encode_image(spec) for spec in specs]
+    futures = {
+        i: _get_executor(max_workers).submit(_encode_image, specs[i]) for i in parallel
+    }
+    contents = [
+        None if i in futures else _encode_image(spec) for i, spec in enumerate(specs)
+    ]
+    for i, future in futures.items():
+        contents[i] = future.result()
+    return contents
+
+
+def get_padded_images(
+    specs: Iterable[tuple[str, int | str, int, int, str | None]],
+    max_workers: int | None = None,
+) -> list[randomizer.PaddedFile]:
+    """
+    Images (extension, size, width, height, name) with virtual padding up to size,
+    in order of specs. Seeds of images are taken from IMAGE_SEEDS by current random generator,
+    so result does not depend on pool, and images are taken from image cache if possible.
+    Only missing ones are encoded
+    """
+    rng = randomizer.get_random()
+    specs = [
+        (randomizer.get_image_format(extension), size, width, height, name)
+        for extension, size, width, height, name in specs
+    ]
+    image_specs = [
+        (_format, width, height, rng.randrange(IMAGE_SEEDS))
+        for _format, _, width, height, _ in specs
+    ]
+    contents = [
+        image_cache.find(_format, 0, width, height, seed)
+        for _format, width, height, seed in image_specs
+    ]
+    missing = [i for i, content in enumerate(contents) if content is None]
+    encoded = encode_images([image_specs[i] for i in missing], max_workers)
+    for i, content in zip(missing, encoded):
+        _format, width, height, seed = image_specs[i]
+        contents[i] = image_cache.add(_format, 0, width, height, seed, content)
+    return [
+        randomizer.pad_image_content(_format, content, size, name)
+        for (_format, size, _, _, name), content in zip(specs, contents)
+    ]
+
+
+def split_size(size: int, count: int) -> list[int]:
+    """
+    Sizes of count files with sum size, the first files are larger by 1 byte if needed
+    """
+    part, rest = divmod(size, count)
+    return [part + (i < rest) for i in range(count)]
+
+
+def get_random_images(
+    count: int,
+    sum_size: int | str,
+    extensions: Iterable[str] = ("png",),
+    width: int | None = None,
+    height: int | None = None,
+    max_workers: int | None = None,
+) -> list[randomizer.PaddedFile]:
+    """
+    count images with sum size sum_size, extensions are used in turn.
+    Dimensions are reduced to fit size of each image as in get_random_image
+    """
+    rng = randomizer.get_random()
+    extensions = tuple(extensions)
+    specs = []
+    for i, size in enumerate(split_size(convert_size_to_bytes(sum_size), count)):
+        extension = extensions[i % len(extensions)].lstrip(".")
+        _size = max(1, size - 800)
+        _width = min(_size, width or rng.randint(1, 1000))
+        _height = min(_size // _width, height or rng.randint(1, 1000))
+        name = f"{randomizer.get_random_string(10, 'wd')}.{extension}"
+        specs.append((extension, size, _width, max(_height, 1), name))
+    return get_padded_images(specs, max_workers)
@@ -1,143 +1,563 @@
-from datetime import datetime, time, timedelta
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from contextvars import ContextVar
+from datetime import date, datetime, time, timedelta
+import hashlib
 import io
+import math
 import os
 import random
 import re
+import shutil
 import string
-from typing import Literal
-from xml.etree import ElementTree
+import tempfile
+from typing import Callable, Iterable, Literal
 
-from dateutil import relativedelta
+from ttoolly.utils.encoders import ENCODERS
 from ttoolly.utils.utils import convert_size_to_bytes
 
+_random = ContextVar("random", default=None)
 
-def get_randname(l: int = 10, _type: str = "a", length_of_chunk: int = 10) -> str:
+# Generated files larger than this are moved from memory to disk
+SPOOL_MAX_SIZE = 1024 * 1024
+WRITE_CHUNK_SIZE = 64 * 1024
+IMAGE_FORMATS = {
+    "bmp": "BMP",
+    "gif": "GIF",
+    "jpg": "JPEG",
+    "jpeg": "JPEG",
+    "png": "PNG",
+    "tiff": "TIFF",
+    "webp": "WEBP",
+}
+
+
+def get_random() -> random.Random:
+    """
+    Random generator of current context, global random module by default,
+    so random.seed controls generated values
+    """
+    return _random.get() or random
+
+
+@contextmanager
+def use_random(rng: random.Random):
+    """
+    All ttoolly generators use rng inside the block
+    """
+    token = _random.set(rng)
+    try:
+        yield rng
+    finally:
+        _random.reset(token)
+
+
+def get_stream_seed(*keys) -> int:
+    """
+    Stable 64 bit seed for keys, the same in all processes
+    """
+    return int.from_bytes(hashlib.sha256(repr(keys).encode()).digest()[:8], "big")
+
+
+class SizeProfile:
+    """
+    Distribution of generated value length.
+    get_length(rng, min_length, max_length) is called with unbounded_max for not set max_length
+    """
+
+    def __init__(
+        self,
+        get_length: Callable[[random.Random, int, int], int],
+        unbounded_max: int = 100000,
+    ):
+        self._get_length = get_length
+        self.unbounded_max = unbounded_max
+
+    def get_length(self, min_length: int = 0, max_length: int | None = None) -> int:
+        min_length = min_length or 1
+        max_length = max_length or max(self.unbounded_max, min_length)
+        length = self._get_length(get_random(), min_length, max_length)
+        return min(max(length, min_length), max_length)
+
+
+size_profiles = {
+    "uniform": SizeProfile(
+        lambda rng, min_length, max_length: rng.randint(min_length, max_length)
+    ),
+    "minimal": SizeProfile(lambda rng, min_length, max_length: min_length),
+    "realistic": SizeProfile(
+        lambda rng, min_length, max_length: min_length
+        - 1
+        + round(rng.lognormvariate(math.log(10), 0.8)),
+        unbounded_max=255,
+    ),
+    "boundary": SizeProfile(
+        lambda rng, min_length, max_length: rng.choice(
+            (min_length, min_length + 1, max_length - 1, max_length)
+        )
+    ),
+}
+DEFAULT_SIZE_PROFILE = os.environ.get("TTOOLLY_SIZE_PROFILE", "realistic")
+_size_profile = ContextVar("size_profile", default=None)
+
+
+def get_size_profile(name: str | None = None) -> SizeProfile:
+    """
+    Profile by name, profile of current context or default profile
+    """
+    name = name or _size_profile.get() or DEFAULT_SIZE_PROFILE
+    try:
+        return size_profiles[name]
+    except KeyError:
+        raise ValueError(
+            f'Unknown size profile "{name}". Available profiles: {", ".join(size_profiles)}'
+        )
+
+
+@contextmanager
+def use_size_profile(name: str | None):
+    """
+    Lengths of generated values inside the block are chosen by profile.
+    With None the current profile is kept
+    """
+    if name is None:
+        yield
+        return
+    get_size_profile(name)
+    token = _size_profile.set(name)
+    try:
+        yield
+    finally:
+        _size_profile.reset(token)
+
+
+def get_alphabet(_type: str = "a") -> str:
     """
     a - all
     d - digits
     w - letters
     p - punctuation
     s - whitespace
+    other symbols are used as is
     """
     if "a" == _type:
-        text = string.printable
-    else:
-        text = ""
-        letters_dict = {
-            "d": string.digits,
-            "w": string.ascii_letters,
-            "p": string.punctuation,
-            "s": string.whitespace,
-        }
-        for t in _type:
-            text += letters_dict.get(t, t)
+        return string.printable
+    letters_dict = {
+        "d": string.digits,
+        "w": string.ascii_letters,
+        "p": string.punctuation,
+        "s": string.whitespace,
+    }
+    return "".join(letters_dict.get(t, t) for t in _type)
+
+
+@lru_cache(maxsize=128)
+def _get_translation(alphabet: str) -> tuple[bytes, bytes, int] | None:
+    """
+    Table mapping random byte to symbol of alphabet, bytes to delete and count of used bytes.
+    Bytes >= used are deleted, so each symbol has equal probability
+    """
+    if not alphabet or len(alphabet) > 256 or max(map(ord, alphabet)) > 255:
+        return None
+    used = 256 - 256 % len(alphabet)
+    table = bytes(ord(alphabet[i % len(alphabet)]) for i in range(used))
+    return table + bytes(256 - used), bytes(range(used, 256)), used
+
+
+def get_random_chars(length: int, alphabet: str) -> str:
+    """
+    Random string of symbols from alphabet, made from random bytes in bulk
+    """
+    if not alphabet:
+        raise ValueError("Alphabet can not be empty")
+    rng = get_random()
+    if (translation := _get_translation(alphabet)) is None:
+        return "".join(rng.choices(alphabet, k=length))
+    table, delete, used = translation
+    chunks = []
+    generated = 0
+    while generated < length:
+        count = (length - generated) * 256 // used + 16
+        chunk = rng.randbytes(count).translate(table, delete)
+        chunks.append(chunk)
+        generated += len(chunk)
+    return b"".join(chunks)[:length].decode("latin-1")
+
+
+def get_random_string(length: int, _type: str = "a") -> str:
+    """
+    Random not repeating string, _type as in get_alphabet
+    """
+    return get_random_chars(length, get_alphabet(_type))
+
 
+def get_randname(l: int = 10, _type: str = "a", length_of_chunk: int = 10) -> str:
+    """
+    String of repeated random chunk, _type as in get_alphabet
+    """
+    text = get_alphabet(_type)
     count_of_chunks = l // length_of_chunk
-    n = "".join(
-        [random.choice(text) for _ in range(length_of_chunk)]
-    ) * count_of_chunks + "".join(
-        [random.choice(text) for _ in range(l % length_of_chunk)]
+    return get_random_chars(length_of_chunk, text) * count_of_chunks + (
+        get_random_chars(l % length_of_chunk, text)
     )
-    return n
 
 
 def get_random_color(type_: Literal['rgb', 'hex'] = 'rgb') -> str:
     if type_ == 'rgb':
-        return f'rgb({random.randint(1, 255)}, {random.randint(1, 255)}, {random.randint(1, 255)})'
+        rng = get_random()
+        return f'rgb({rng.randint(1, 255)}, {rng.randint(1, 255)}, {rng.randint(1, 255)})'
     if type_ == 'hex':
-        return '#%06x' % random.randint(0, 0xFFFFFF)
+        return '#%06x' % get_random().randint(0, 0xFFFFFF)
+
+
+@lru_cache(maxsize=1)
+def _get_month_bounds(today: date) -> tuple[datetime, datetime]:
+    month_start = datetime.combine(today.replace(day=1), time.min)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(
+        microseconds=1
+    )
+    return month_start, month_end
 
 
 def get_random_datetime_value(
     datetime_from=None,
     datetime_to=None,
 ):
-    month_start = datetime.combine(datetime.today().replace(day=1), time.min)
-    month_end = (
-        month_start + relativedelta.relativedelta(months=1) - timedelta(microseconds=1)
-    )
+    """
+    Random datetime with microseconds between datetime_from and datetime_to,
+    current month by default
+    """
+    month_start, month_end = _get_month_bounds(date.today())
     datetime_from = datetime_from or month_start
     datetime_to = datetime_to or month_end
-    return datetime.fromtimestamp(
-        random.randint(
-            int(datetime_from.timestamp() * 10**6),
-            int(datetime_to.timestamp() * 10**6),
-        )
-        / 10**6
+    microseconds = (datetime_to - datetime_from) // timedelta(microseconds=1)
+    return datetime_from + timedelta(
+        microseconds=get_random().randint(0, microseconds)
     )
 
 
-def get_random_domain_value(length):
-    end_length = random.randint(2, min(length - 2, 6))
-    domain_length = random.randint(1, min(length - end_length - 1, 62))
+DOMAIN_LABEL_EDGE = string.ascii_lowercase + string.digits
+DOMAIN_LABEL_MIDDLE = DOMAIN_LABEL_EDGE + "-"
+DOMAIN_END = string.ascii_lowercase
+EMAIL_SAFE_SYMBOLS = string.ascii_lowercase + string.digits
+EMAIL_ESCAPED_SYMBOLS = '\\"(),:;<>@[]'
+EMAIL_SYMBOLS = (
+    EMAIL_SAFE_SYMBOLS + "!#$%&'*+-/=?^_`{|}~." + EMAIL_ESCAPED_SYMBOLS
+)
+MAX_EMAIL_USERNAME_LENGTH = 64
+MAX_DOMAIN_LABEL_LENGTH = 63
+_email_escape_re = re.compile(r'[\\"(),:;<>@\[\]]')
+# Leading, trailing and repeated dots
+_email_dots_re = re.compile(r"^\.|\.(?=\.)|\.$")
+
+
+def _fill_plans(plans: list[list[tuple[str, int] | str]]) -> list[str]:
+    """
+    Each plan is list of literal strings and (alphabet, length) parts.
+    Symbols of each alphabet are generated in one call for all plans
+    """
+    counts = {}
+    for plan in plans:
+        for part in plan:
+            if isinstance(part, tuple):
+                counts[part[0]] = counts.get(part[0], 0) + part[1]
+    symbols = {alphabet: get_random_chars(count, alphabet) for alphabet, count in counts.items()}
+    positions = dict.fromkeys(counts, 0)
+    result = []
+    for plan in plans:
+        value = []
+        for part in plan:
+            if isinstance(part, str):
+                value.append(part)
+                continue
+            alphabet, length = part
+            position = positions[alphabet]
+            value.append(symbols[alphabet][position : position + length])
+            positions[alphabet] = position + length
+        result.append("".join(value))
+    return result
+
+
+def _plan_domain_label(length: int) -> list[tuple[str, int]]:
+    if length == 1:
+        return [(DOMAIN_LABEL_EDGE, 1)]
+    return [
+        (DOMAIN_LABEL_EDGE, 1),
+        (DOMAIN_LABEL_MIDDLE, length - 2),
+        (DOMAIN_LABEL_EDGE, 1),
+    ]
+
+
+def _plan_domain(length: int) -> list[tuple[str, int] | str]:
+    rng = get_random()
+    end_length = rng.randint(2, min(length - 2, 6))
+    domain_length = rng.randint(1, min(length - end_length - 1, MAX_DOMAIN_LABEL_LENGTH - 1))
     subdomain_length = length - end_length - 1 - domain_length - 1
-    if subdomain_length <= 1:
-        subdomain = ""
-        if subdomain_length >= 0:
-            domain_length += 1 + subdomain_length
-    else:
-        subdomain = (
-            f"{get_randname(1, 'w')}{get_randname(subdomain_length - 1, 'wd.-')}."
-        )
-        while any([len(el) > 62 for el in subdomain.split(".")]):
-            subdomain = ".".join(
-                [
-                    (el if len(el) <= 62 else el[:61] + "." + el[62:])
-                    for el in subdomain.split(".")
-                ]
+    plan = []
+    if subdomain_length == 0:
+        domain_length += 1
+    elif subdomain_length > 0:
+        while subdomain_length > MAX_DOMAIN_LABEL_LENGTH or (
+            subdomain_length > 2 and rng.random() < 0.3
+        ):
+            label_length = rng.randint(
+                1, min(MAX_DOMAIN_LABEL_LENGTH, subdomain_length - 2)
             )
-        subdomain = re.sub(r"\.[\.\-]", ".%s" % get_randname(1, "w"), subdomain)
-        subdomain = re.sub(r"\-\.", "%s." % get_randname(1, "w"), subdomain)
-    if domain_length < 3:
-        domain = get_randname(domain_length, "wd")
-    else:
-        domain = "%s%s%s" % (
-            get_randname(1, "w"),
-            get_randname(domain_length - 2, "wd-"),
-            get_randname(1, "w"),
-        )
-        domain = re.sub(r"\-\-", "%s-" % get_randname(1, "w"), domain)
+            plan += _plan_domain_label(label_length) + ["."]
+            subdomain_length -= label_length + 1
+        plan += _plan_domain_label(subdomain_length) + ["."]
+    return plan + _plan_domain_label(domain_length) + [".", (DOMAIN_END, end_length)]
+
+
+def get_random_domain_values(lengths: Iterable[int]) -> list[str]:
+    """
+    Domains of given lengths, symbols of all domains are generated at once
+    """
+    return _fill_plans([_plan_domain(length) for length in lengths])
+
 
-    return "%s%s.%s" % (subdomain, domain, get_randname(end_length, "w"))
+def get_random_domain_value(length):
+    return get_random_domain_values([length])[0]
 
 
-def get_random_email_value(length, safe=False):
+def _fix_email_username(username: str) -> str:
+    """
+    Escape special symbols, replace leading, trailing and repeated dots and
+    backslash left without pair after cut
     """
+    rng = get_random()
+    length = len(username)
+    username = _email_escape_re.sub(r"\\\g<0>", username)[:length]
+    if (len(username) - len(username.rstrip("\\"))) % 2:
+        username = username[:-1] + rng.choice(EMAIL_SAFE_SYMBOLS)
+    return _email_dots_re.sub(lambda m: rng.choice(EMAIL_SAFE_SYMBOLS), username)
+
+
+def get_random_email_values(lengths: Iterable[int], safe: bool = False) -> list[str]:
+    """
+    Emails of given lengths, symbols of all emails are generated at once.
+    With safe username contains only letters and digits
     https://www.ietf.org/rfc/rfc2821.txt
     https://www.ietf.org/rfc/rfc3696.txt
     """
-    if length < 3:  # a@b
-        raise ValueError("Email length cannot be less than 3")
-    if length < 6:  # a@b.cd
-        username = get_randname(1, "wd")
-        domain = get_randname(length - 2, "wd")
-        return f"{username}@{domain}".lower()
-
-    MAX_USERNAME_LENGTH = 64
-    min_length_without_name = 1 + 1 + 3  # @X.aa
-    name_length = random.randint(
-        min(2, length - min_length_without_name),
-        min(MAX_USERNAME_LENGTH, length - min_length_without_name),
+    rng = get_random()
+    username_plans = []
+    domain_plans = []
+    for length in lengths:
+        if length < 3:  # a@b
+            raise ValueError("Email length cannot be less than 3")
+        if length < 6:  # a@b.cd
+            username_plans.append([(EMAIL_SAFE_SYMBOLS, 1)])
+            domain_plans.append([(DOMAIN_LABEL_EDGE, length - 2)])
+            continue
+        min_length_without_name = 1 + 1 + 3  # @X.aa
+        name_length = rng.randint(
+            min(2, length - min_length_without_name),
+            min(MAX_EMAIL_USERNAME_LENGTH, length - min_length_without_name),
+        )
+        symbols = EMAIL_SYMBOLS if not safe and name_length > 1 else EMAIL_SAFE_SYMBOLS
+        username_plans.append([(symbols, name_length)])
+        domain_plans.append(_plan_domain(length - name_length - 1))
+    usernames = _fill_plans(username_plans)
+    if not safe:
+        usernames = [_fix_email_username(username) for username in usernames]
+    return [
+        f"{username}@{domain}"
+        for username, domain in zip(usernames, _fill_plans(domain_plans))
+    ]
+
+
+def get_random_email_value(length, safe=False):
+    return get_random_email_values([length], safe)[0]
+
+
+class SpooledFile(tempfile.SpooledTemporaryFile):
+    """
+    Temporary file kept in memory up to max_size bytes and on disk after that.
+    name is name of generated file, as for uploaded file
+    """
+
+    def __init__(self, name: str, max_size: int = SPOOL_MAX_SIZE):
+        super().__init__(max_size=max_size)
+        self._filename = name
+
+    @property
+    def name(self) -> str:
+        return self._filename
+
+
+class PaddedFile(io.RawIOBase):
+    """
+    Read-only file of content, padding_size padding symbols and suffix.
+    Padding is virtual: it is not allocated and is produced by chunks on read
+    """
+
+    def __init__(
+        self,
+        content: bytes,
+        padding_size: int = 0,
+        padding: bytes = b"\0",
+        suffix: bytes = b"",
+        name: str | None = None,
+    ):
+        super().__init__()
+        self.name = name
+        self._content = content
+        self._suffix = suffix
+        self._padding_start = len(content)
+        self._suffix_start = self._padding_start + max(padding_size, 0)
+        self._padding_chunk = padding * WRITE_CHUNK_SIZE
+        self.size = self._suffix_start + len(suffix)
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._position
+        elif whence == io.SEEK_END:
+            offset += self.size
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self._position = offset
+        return offset
+
+    def readinto(self, buffer) -> int:
+        buffer = memoryview(buffer).cast("B")
+        start = self._position
+        end = min(self.size, start + len(buffer))
+        position = start
+        while position < end:
+            if position < self._padding_start:
+                chunk = self._content[position : min(end, self._padding_start)]
+            elif position < self._suffix_start:
+                chunk_end = min(end, self._suffix_start, position + WRITE_CHUNK_SIZE)
+                chunk = self._padding_chunk[: chunk_end - position]
+            else:
+                chunk = self._suffix[position - self._suffix_start : end - self._suffix_start]
+            buffer[position - start : position - start + len(chunk)] = chunk
+            position += len(chunk)
+        self._position = max(start, end)
+        return max(end - start, 0)
+
+
+def write_padding(f, size: int, symbol: bytes = b"\0") -> None:
+    """
+    Write size symbols by chunks
+    """
+    chunk = symbol * WRITE_CHUNK_SIZE
+    while size > 0:
+        f.write(chunk[:size])
+        size -= WRITE_CHUNK_SIZE
+
+
+def write_random_file_content(f, size: int) -> None:
+    """
+    Write size random letters and digits by chunks
+    """
+    while size > 0:
+        f.write(get_random_string(min(size, WRITE_CHUNK_SIZE), "wd").encode())
+        size -= WRITE_CHUNK_SIZE
+
+
+def get_image_format(extension: str) -> str:
+    """
+    Format name for extension: SVG or Pillow format, JPEG for unknown extensions
+    """
+    extension = extension.lower().lstrip(".")
+    return "SVG" if extension == "svg" else IMAGE_FORMATS.get(extension, "JPEG")
+
+
+def pad_image_content(
+    _format: str, content: bytes, size: int | str | None = None, name: str | None = None
+) -> PaddedFile:
+    """
+    Image content with virtual padding up to size: zeros or svg comment
+    """
+    size = convert_size_to_bytes(size or 0)
+    if _format == "SVG" and size > len(content):
+        return PaddedFile(
+            bytes(content) + b"<!-- ", size - len(content) - 9, b"a", b" -->", name
+        )
+    return PaddedFile(content, size - len(content), name=name)
+
+
+def get_padded_image(
+    extension: str,
+    size: int | str | None = None,
+    width: int = 1,
+    height: int = 1,
+    seed: int | None = None,
+    name: str | None = None,
+) -> PaddedFile:
+    """
+    Image with extension and virtual padding up to size: zeros or svg comment.
+    With seed image is taken from image cache
+    """
+    _format = get_image_format(extension)
+    if seed is not None:
+        from ttoolly.utils.images import image_cache
+
+        content = image_cache.get(_format, 0, width, height, seed)
+    elif _format == "SVG":
+        content = get_random_svg_content(0, width, height)
+    else:
+        content = get_random_img_content(_format, 0, width, height)
+    return pad_image_content(_format, content, size, name)
+
+
+def write_random_image_content(
+    f,
+    extension: str,
+    size: int | str | None = None,
+    width: int = 1,
+    height: int = 1,
+    seed: int | None = None,
+) -> None:
+    """
+    Write image with extension and padding up to size, padding is written by chunks.
+    With seed image is taken from image cache
+    """
+    shutil.copyfileobj(
+        get_padded_image(extension, size, width, height, seed), f, WRITE_CHUNK_SIZE
     )
 
-    domain_length = length - name_length - 1  # <name>@<domain>
-    symbols_for_generate = "wd"
-    symbols_with_escaping = ""
-    if not safe and name_length > 1:
-        symbols_for_generate += "!#$%&'*+-/=?^_`{|}~."
-        symbols_with_escaping = '\\"(),:;<>@[]'
-        symbols_for_generate += symbols_with_escaping
-    username = get_randname(name_length, symbols_for_generate)
-    while ".." in username:
-        username = username.replace("..", get_randname(1, "wd") + ".")
-    for s in symbols_with_escaping:
-        if s in username:
-            username = username.replace(s, fr"\{s}")[:name_length]
-    username = re.sub(r"(\.$)|(^\.)|(\\$)", get_randname(1, "wd"), username)
-    while len(username) < name_length:
-        username += get_randname(1, "wd")
-    domain = get_random_domain_value(domain_length)
-    return f"{username}@{domain}".lower()
+
+def _get_random_image_params(
+    filename: str = '',
+    size: int | str | None = None,
+    width: int | None = None,
+    height: int | None = None,
+) -> tuple[str, str, int, int, int]:
+    """
+    Filename, extension, size and dimensions of random image,
+    dimensions are reduced to fit size
+    """
+    width = width or get_random().randint(1, 1000)
+    height = height or get_random().randint(1, 1000)
+
+    filename = filename or get_random_string(10, 'wrd ').strip()
+    extension = os.path.splitext(filename)[1].lower()
+    if extension in ('.bmp',):
+        size = convert_size_to_bytes(size or 10)
+        width = height = 1
+    elif size is not None:
+        size = convert_size_to_bytes(size)
+        _size = max(1, size - 800)
+        width = min(_size, width)
+        height = min(int(_size / width), height)
+    else:
+        size = 10
+    if extension not in ('.bmp', '.gif', '.svg', '.png'):
+        extension = '.jpg'
+    return filename, extension, size, width, height
 
 
 def get_random_image(
@@ -146,48 +566,70 @@ def get_random_image(
     size: int | str | None = None,
     width: int | None = None,
     height: int | None = None,
+    seed: int | None = None,
 ):
     """
-    generate image file with size
+    generate image file with size.
+    Without path it is BytesIO. With seed image is taken from image cache
     """
-    width = width or random.randint(1, 1000)
-    height = height or random.randint(1, 1000)
-
-    filename = filename or get_randname(10, 'wrd ').strip()
-    if os.path.splitext(filename)[1] in ('.bmp',):
-        content = get_random_bmp_content(convert_size_to_bytes(size or 10))
-    else:
-        if size is not None:
-            size = convert_size_to_bytes(size)
-            _size = max(1, size - 800)
-            width = min(_size, width)
-            height = min(int(_size / width), height)
-        else:
-            size = 10
-        content = {
-            '.gif': get_random_gif_content,
-            '.svg': get_random_svg_content,
-            '.png': get_random_png_content,
-        }.get(os.path.splitext(filename)[1].lower(), get_random_jpg_content)(
-            size, width, height
-        )
+    filename, extension, size, width, height = _get_random_image_params(
+        filename, size, width, height
+    )
     if path:
-        if os.path.exists(os.path.join(path, filename)):
-            os.remove(os.path.join(path, filename))
-        with open(os.path.join(path, filename), 'ab') as f:
-            f.write(content)
-    else:
-        f = io.BytesIO()
-        f.write(content)
+        with open(os.path.join(path, filename), 'wb') as f:
+            write_random_image_content(f, extension, size, width, height, seed)
+        return f
+    f = io.BytesIO()
+    f.name = filename
+    write_random_image_content(f, extension, size, width, height, seed)
+    f.seek(0)
     return f
 
 
-def get_random_img_content(_format, size=10, width=1, height=1):
+def get_random_padded_image(
+    filename: str = '',
+    size: int | str | None = None,
+    width: int | None = None,
+    height: int | None = None,
+    seed: int | None = None,
+) -> PaddedFile:
+    """
+    Image like get_random_image, but padding up to size is virtual,
+    so large image is not kept in memory. File is read-only
+    """
+    filename, extension, size, width, height = _get_random_image_params(
+        filename, size, width, height
+    )
+    return get_padded_image(extension, size, width, height, seed, filename)
+
+
+def get_random_img_content(_format, size=10, width=1, height=1, seed=None, rich=False):
+    """
+    With seed content is the same for the same arguments.
+    BMP, GIF and PNG are filled with one color by built-in encoders, rich images
+    with shapes and other formats require Pillow
+    """
+    size = convert_size_to_bytes(size)
+    _format = _format.upper()
+    with use_random(random.Random(seed)) if seed is not None else nullcontext():
+        if not rich and _format in ENCODERS:
+            rng = get_random()
+            content = ENCODERS[_format](
+                width, height, (rng.randrange(256), rng.randrange(256), rng.randrange(256))
+            )
+        else:
+            content = _get_rich_img_content(_format, width, height)
+    size -= len(content)
+    if size > 0:
+        content += bytearray(size)
+    return content
+
+
+def _get_rich_img_content(_format, width, height):
     try:
         from PIL import Image, ImageDraw
     except ImportError:
         raise ImportError("Pillow required. Install ttoolly as ttoolly[images]")
-    size = convert_size_to_bytes(size)
     image = Image.new('RGB', (width, height), get_random_color('hex'))
     draw = ImageDraw.Draw(image)
     draw.rectangle(
@@ -204,15 +646,10 @@ def get_random_img_content(_format, size=10, width=1, height=1):
         outline=get_random_color('hex'),
         width=3,
     )
-
     output = io.BytesIO()
     image.save(output, format=_format)
-    content = output.getvalue()
-    size -= len(content)
-    if size > 0:
-        content += bytearray(size)
     del draw
-    return content
+    return output.getvalue()
 
 
 def get_random_bmp_content(size=10, width=1, height=1):
@@ -231,46 +668,46 @@ def get_random_png_content(size=10, width=1, height=1):
     return get_random_img_content('PNG', size, width, height)
 
 
-def get_random_svg_content(size=10, width=1, height=1):
+SVG_HEADER = (
+    b'<?xml version="1.0" standalone="no"?>\n'
+    b'<!DOCTYPE svg PUBLIC "-//W3C//DTD SVG 1.1//EN" "http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd">\n'
+)
+
+
+def write_random_svg_content(f, size=10, width=1, height=1, seed=None) -> int:
     """
-    generates svg content
+    Write svg to binary file f, padded by comment up to size by chunks.
+    Return count of written bytes
     """
     size = convert_size_to_bytes(size)
-    doc = ElementTree.Element(
-        'svg',
-        width=str(width),
-        height=str(height),
-        version='1.1',
-        xmlns='http://www.w3.org/2000/svg',
-    )
-    ElementTree.SubElement(
-        doc,
-        'rect',
-        width=str(width),
-        height=str(height),
-        style=f'fill:{get_random_color()};stroke-width:3;stroke:{get_random_color()}',
-    )
-
+    with use_random(random.Random(seed)) if seed is not None else nullcontext():
+        rect_style = (
+            f'fill:{get_random_color()};stroke-width:3;stroke:{get_random_color()}'
+        )
+        circle_style = (
+            f'fill:{get_random_color()};stroke-width:3;stroke:{get_random_color()}'
+        )
     circle_r = int(min(width, height) / 2 - 1)
-    ElementTree.SubElement(
-        doc,
-        'circle',
-        r=str(circle_r),
-        cx=str(int(width / 2)),
-        cy=str(int(height / 2)),
-        style=f'fill:{get_random_color()};stroke-width:3;stroke:{get_random_color()}',
-    )
-
-    output = io.StringIO()
-    header = (
-        '<?xml version=\"1.0\" standalone=\"no\"?>\n'
-        '<!DOCTYPE svg PUBLIC \"-//W3C//DTD SVG 1.1//EN\" \"http://www.w3.org/Graphics/SVG/1.1/DTD/svg11.dtd\">\n'
-    )
-    output.write(header)
-    output.write(ElementTree.tostring(doc).decode())
-    content = output.getvalue()
-    size -= len(content)
-    if size > 0:
-        content += '<!-- %s -->' % ('a' * (size - 9))
-    output.close()
-    return content.encode()
+    content = SVG_HEADER + (
+        f'<svg width="{width}" height="{height}" version="1.1" xmlns="http://www.w3.org/2000/svg">'
+        f'<rect width="{width}" height="{height}" style="{rect_style}" />'
+        f'<circle r="{circle_r}" cx="{int(width / 2)}" cy="{int(height / 2)}" style="{circle_style}" />'
+        '</svg>'
+    ).encode()
+    f.write(content)
+    if (size := size - len(content)) <= 0:
+        return len(content)
+    f.write(b"<!-- ")
+    write_padding(f, size - 9, b"a")
+    f.write(b" -->")
+    return len(content) + max(size, 9)
+
+
+def get_random_svg_content(size=10, width=1, height=1, seed=None):
+    """
+    generates svg content.
+    With seed content is the same for the same arguments
+    """
+    output = io.BytesIO()
+    write_random_svg_content(output, size, width, height, seed)
+    return output.getvalue()
@@ -0,0 +1,417 @@
+import string
+import threading
+from collections import OrderedDict
+from functools import cached_property, lru_cache
+
+from ttoolly.utils.randomizer import get_random, get_size_profile
+
+try:
+    from re import _parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+# Like in rstr, * and + are repeated no more than STAR_PLUS_LIMIT times
+STAR_PLUS_LIMIT = 100
+REGEX_CACHE_SIZE = 256
+LENGTH_TABLES_SIZE = 8
+
+PRINTABLE = string.printable
+CATEGORIES = {
+    "category_digit": string.digits,
+    "category_not_digit": string.ascii_letters + string.punctuation,
+    "category_space": string.whitespace,
+    "category_not_space": string.printable.strip(),
+    "category_word": string.ascii_letters + string.digits + "_",
+    "category_not_word": "".join(
+        sorted(
+            set(string.printable).difference(
+                string.ascii_letters + string.digits + "_"
+            )
+        )
+    ),
+}
+
+
+def _add_lengths(first: int, second: int, mask: int) -> int:
+    """
+    Lengths of concatenation: sums of lengths of two sets, sets are bit masks
+    """
+    if first.bit_count() > second.bit_count():
+        first, second = second, first
+    result = 0
+    while first:
+        low = first & -first
+        result |= second << (low.bit_length() - 1)
+        first ^= low
+    return result & mask
+
+
+def _get_lengths_list(lengths: int, max_length: int) -> list[int]:
+    """
+    Lengths of bit mask set, not greater than max_length
+    """
+    lengths &= (1 << (max_length + 1)) - 1
+    return [i for i, bit in enumerate(bin(lengths)[:1:-1]) if bit == "1"]
+
+
+class _GroupReference(Exception):
+    """
+    Length of group reference depends on generated group value, it can not be planned
+    """
+
+
+class _LengthTables(dict):
+    """
+    Possible lengths (up to max_length) of regex elements and data for their sampling
+    """
+
+    def __init__(self, max_length: int):
+        super().__init__()
+        self.mask = (1 << (max_length + 1)) - 1
+
+
+class _LengthNode:
+    """
+    Regex element which generates value of given length.
+    Node is not changed after creation, its possible lengths for each max_length
+    are kept in separate tables, so it can be shared by threads
+    """
+
+    def get_lengths(self, tables: _LengthTables) -> int:
+        if self not in tables:
+            tables[self] = self._compute(tables)
+        return tables[self][0]
+
+    def _compute(self, tables: _LengthTables) -> tuple:
+        """
+        (lengths bit mask, data for sampling)
+        """
+        raise NotImplementedError
+
+    def sample(self, rng, length: int, tables: _LengthTables) -> str:
+        raise NotImplementedError
+
+
+class _Chars(_LengthNode):
+    def __init__(self, alphabet):
+        self.alphabet = alphabet
+
+    def _compute(self, tables):
+        return (0b10 if self.alphabet else 0) & tables.mask, None
+
+    def sample(self, rng, length, tables):
+        return rng.choice(self.alphabet)
+
+
+class _Sequence(_LengthNode):
+    def __init__(self, items: list[_LengthNode]):
+        self.items = items
+
+    def _compute(self, tables):
+        # lengths of items[i:] for each i
+        suffixes = [1]
+        for item in reversed(self.items):
+            suffixes.append(
+                _add_lengths(item.get_lengths(tables), suffixes[-1], tables.mask)
+            )
+        suffixes.reverse()
+        return suffixes[0], suffixes
+
+    def sample(self, rng, length, tables):
+        parts = []
+        for item, rest in zip(self.items, tables[self][1][1:]):
+            item_length = rng.choice(
+                [
+                    i
+                    for i in _get_lengths_list(item.get_lengths(tables), length)
+                    if rest >> (length - i) & 1
+                ]
+            )
+            parts.append(item.sample(rng, item_length, tables))
+            length -= item_length
+        return "".join(parts)
+
+
+class _Branch(_LengthNode):
+    def __init__(self, branches: list[_LengthNode]):
+        self.branches = branches
+
+    def _compute(self, tables):
+        lengths = 0
+        for branch in self.branches:
+            lengths |= branch.get_lengths(tables)
+        return lengths, None
+
+    def sample(self, rng, length, tables):
+        branch = rng.choice(
+            [b for b in self.branches if b.get_lengths(tables) >> length & 1]
+        )
+        return branch.sample(rng, length, tables)
+
+
+class _Star(_LengthNode):
+    """
+    Any number of non-empty values of item
+    """
+
+    def __init__(self, item: _LengthNode):
+        self.item = item
+
+    def _compute(self, tables):
+        item_lengths = self.item.get_lengths(tables) & ~1
+        lengths = 1
+        while True:
+            extended = lengths | _add_lengths(lengths, item_lengths, tables.mask)
+            if extended == lengths:
+                break
+            lengths = extended
+        return lengths, item_lengths
+
+    def sample(self, rng, length, tables):
+        lengths, item_lengths = tables[self]
+        item_lengths = _get_lengths_list(item_lengths, length)
+        parts = []
+        while length:
+            item_length = rng.choice(
+                [i for i in item_lengths if i <= length and lengths >> (length - i) & 1]
+            )
+            parts.append(self.item.sample(rng, item_length, tables))
+            length -= item_length
+        return "".join(parts)
+
+
+class _UpTo(_LengthNode):
+    """
+    From 0 to limit non-empty values of item
+    """
+
+    def __init__(self, item: _LengthNode, limit: int):
+        self.item = item
+        self.limit = limit
+
+    def _compute(self, tables):
+        item_lengths = self.item.get_lengths(tables) & ~1
+        # lengths for each number of values left, the last one is kept
+        # when more values do not add lengths
+        levels = [1]
+        for _ in range(self.limit):
+            level = 1 | _add_lengths(levels[-1], item_lengths, tables.mask)
+            if level == levels[-1]:
+                break
+            levels.append(level)
+        return levels[-1], (item_lengths, levels)
+
+    def sample(self, rng, length, tables):
+        item_lengths, levels = tables[self][1]
+        item_lengths = _get_lengths_list(item_lengths, length)
+        parts = []
+        for rest in reversed(levels[:-1]):
+            if not length:
+                break
+            item_length = rng.choice(
+                [i for i in item_lengths if i <= length and rest >> (length - i) & 1]
+            )
+            parts.append(self.item.sample(rng, item_length, tables))
+            length -= item_length
+        return "".join(parts)
+
+
+class RegexSampler:
+    """
+    Generator of strings matching regex. Pattern is parsed once into generation plan,
+    values are generated like rstr.xeger does.
+    Values with bounded length are generated from possible lengths of regex elements,
+    so there are no retries
+    """
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.parsed = sre_parse.parse(pattern)
+        self._generate = self._as_function(self._compile_sequence(self.parsed))
+        self._length_tables = OrderedDict()
+        self._length_tables_lock = threading.Lock()
+
+    def get_random_value(
+        self, min_length: int | None = None, max_length: int | None = None
+    ) -> str:
+        """
+        Value with length from min_length to max_length, if any of them is set.
+        Length is chosen by size profile from lengths which regex values can have,
+        then length of each element is chosen uniformly from lengths which fit the rest.
+        * and + are not limited, but max_length is min_length + STAR_PLUS_LIMIT by default.
+        Length of regex with group references can not be bounded, its values are generated
+        like without length
+        """
+        if (min_length is None and max_length is None) or self._length_node is None:
+            return self._generate(get_random(), {})
+        min_length = min_length or 0
+        if max_length is None:
+            max_length = min_length + STAR_PLUS_LIMIT
+        tables = self._get_length_tables(max_length)
+        lengths = _get_lengths_list(self._length_node.get_lengths(tables), max_length)
+        lengths = [length for length in lengths if length >= min_length]
+        if not lengths:
+            raise ValueError(
+                f"Regex {self.pattern} has no values with length from {min_length} to {max_length}"
+            )
+        length = lengths[get_size_profile().get_length(1, len(lengths)) - 1]
+        return self._length_node.sample(get_random(), length, tables)
+
+    def _get_length_tables(self, max_length: int) -> _LengthTables:
+        """
+        Tables of possible lengths, built once for each of LENGTH_TABLES_SIZE last max_length
+        """
+        with self._length_tables_lock:
+            if (tables := self._length_tables.get(max_length)) is None:
+                tables = _LengthTables(max_length)
+                self._length_node.get_lengths(tables)
+                self._length_tables[max_length] = tables
+                while len(self._length_tables) > LENGTH_TABLES_SIZE:
+                    self._length_tables.popitem(last=False)
+            self._length_tables.move_to_end(max_length)
+            return tables
+
+    @cached_property
+    def _length_node(self) -> _LengthNode | None:
+        """
+        None for regex with group references
+        """
+        try:
+            return self._compile_length_sequence(self.parsed)
+        except _GroupReference:
+            return None
+
+    def _compile_length_sequence(self, items) -> _LengthNode:
+        nodes = [self._compile_length(opcode.name.lower(), value) for opcode, value in items]
+        return nodes[0] if len(nodes) == 1 else _Sequence(nodes)
+
+    def _compile_length(self, opcode: str, value) -> _LengthNode:
+        if opcode == "literal":
+            return _Chars(chr(value))
+        if opcode in ("at", "assert_not"):
+            return _Sequence([])
+        if opcode == "not_literal":
+            return _Chars(PRINTABLE.replace(chr(value), ""))
+        if opcode == "any":
+            return _Chars(PRINTABLE.replace("\n", ""))
+        if opcode == "in":
+            return _Chars(self._get_alphabet(value))
+        if opcode == "category":
+            return _Chars(CATEGORIES[value.name.lower()])
+        if opcode == "branch":
+            return _Branch([self._compile_length_sequence(items) for items in value[1]])
+        if opcode == "subpattern":
+            return self._compile_length_sequence(value[-1])
+        if opcode == "atomic_group":
+            return self._compile_length_sequence(value)
+        if opcode == "assert":
+            return self._compile_length_sequence(value[1])
+        if opcode == "groupref":
+            raise _GroupReference
+        if opcode in ("max_repeat", "min_repeat", "possessive_repeat"):
+            start, end, items = value
+            item = self._compile_length_sequence(items)
+            if end == sre_parse.MAXREPEAT:
+                tail = [_Star(item)]
+            else:
+                tail = [_UpTo(item, end - start)] if end > start else []
+            return _Sequence([item] * start + tail)
+        raise ValueError(f'Unsupported regex element "{opcode}" in {self.pattern}')
+
+    @staticmethod
+    def _as_function(plan):
+        if isinstance(plan, str):
+            return lambda rng, groups: plan
+        return plan
+
+    def _compile_sequence(self, items):
+        """
+        Constant string or function(rng, groups) generating string
+        """
+        parts = []
+        for opcode, value in items:
+            part = self._compile(opcode.name.lower(), value)
+            if isinstance(part, str) and parts and isinstance(parts[-1], str):
+                parts[-1] += part
+            else:
+                parts.append(part)
+        if not parts:
+            return ""
+        if len(parts) == 1:
+            return parts[0]
+        parts = [self._as_function(part) for part in parts]
+        return lambda rng, groups: "".join([part(rng, groups) for part in parts])
+
+    def _compile(self, opcode: str, value):
+        if opcode == "literal":
+            return chr(value)
+        if opcode in ("at", "assert_not"):
+            return ""
+        if opcode == "not_literal":
+            alphabet = PRINTABLE.replace(chr(value), "")
+            return lambda rng, groups: rng.choice(alphabet)
+        if opcode == "any":
+            alphabet = PRINTABLE.replace("\n", "")
+            return lambda rng, groups: rng.choice(alphabet)
+        if opcode == "in":
+            alphabet = self._get_alphabet(value)
+            return lambda rng, groups: rng.choice(alphabet)
+        if opcode == "category":
+            alphabet = CATEGORIES[value.name.lower()]
+            return lambda rng, groups: rng.choice(alphabet)
+        if opcode == "branch":
+            branches = [
+                self._as_function(self._compile_sequence(items)) for items in value[1]
+            ]
+            return lambda rng, groups: rng.choice(branches)(rng, groups)
+        if opcode in ("subpattern", "atomic_group"):
+            group = value[0] if opcode == "subpattern" else None
+            items = value[-1] if opcode == "subpattern" else value
+            plan = self._compile_sequence(items)
+            if not group:
+                return plan
+            plan = self._as_function(plan)
+
+            def generate_group(rng, groups):
+                groups[group] = result = plan(rng, groups)
+                return result
+
+            return generate_group
+        if opcode == "assert":
+            return self._compile_sequence(value[1])
+        if opcode == "groupref":
+            return lambda rng, groups: groups.get(value, "")
+        if opcode in ("max_repeat", "min_repeat", "possessive_repeat"):
+            start, end, items = value
+            end = max(start, min(end, STAR_PLUS_LIMIT))
+            plan = self._as_function(self._compile_sequence(items))
+            return lambda rng, groups: "".join(
+                [plan(rng, groups) for _ in range(rng.randint(start, end))]
+            )
+        raise ValueError(f'Unsupported regex element "{opcode}" in {self.pattern}')
+
+    @staticmethod
+    def _get_alphabet(items) -> list[str]:
+        """
+        Characters of [...] set, with repeats like in rstr
+        """
+        negate = False
+        candidates = []
+        for opcode, value in items:
+            opcode = opcode.name.lower()
+            if opcode == "negate":
+                negate = True
+            elif opcode == "literal":
+                candidates.append(chr(value))
+            elif opcode == "range":
+                candidates.extend(chr(i) for i in range(value[0], value[1] + 1))
+            elif opcode == "category":
+                candidates.extend(CATEGORIES[value.name.lower()])
+        if negate:
+            return sorted(set(PRINTABLE).difference(candidates))
+        return candidates
+
+
+@lru_cache(maxsize=REGEX_CACHE_SIZE)
+def get_regex_sampler(pattern: str) -> RegexSampler:
+    return RegexSampler(pattern)
@@ -1,9 +1,24 @@
-from faker import Faker
+from decimal import Decimal
+from functools import cache
 import re
 import sys
 import traceback
 
-fake = Faker()
+
+@cache
+def get_faker():
+    """
+    Faker is imported and created on first use, it is too slow for import time
+    """
+    from faker import Faker
+
+    return Faker()
+
+
+def __getattr__(name):
+    if name == "fake":
+        return get_faker()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class continue_on_fail:
@@ -46,3 +61,44 @@ def get_all_subclasses(cls):
     for subclass in cls.__subclasses__():
         yield from get_all_subclasses(subclass)
         yield subclass
+
+
+def get_definition_key(value):
+    """
+    Hashable representation of a config value, equal for structurally identical values
+    """
+    if isinstance(value, dict):
+        return tuple(sorted((k, get_definition_key(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return (type(value).__name__,) + tuple(get_definition_key(v) for v in value)
+    if isinstance(value, (set, frozenset)):
+        return ("set",) + tuple(sorted(get_definition_key(v) for v in value))
+    return (type(value).__name__, repr(value))
+
+
+def get_decimal_places(value: Decimal) -> int:
+    """
+    Count of decimal places of not integral value: 2 for Decimal("1.50"), 0 for Decimal("1.0")
+    """
+    sign, digits, exponent = value.as_tuple()
+    if exponent >= 0 or not any(digits[exponent:]):
+        return 0
+    return -exponent
+
+
+def decimal_to_scaled_int(value: Decimal, places: int) -> int:
+    """
+    Exact value * 10 ** places for value with no more than places decimal places
+    """
+    sign, digits, exponent = value.as_tuple()
+    number = int("".join(map(str, digits)))
+    shift = exponent + places
+    number = number * 10**shift if shift >= 0 else number // 10**-shift
+    return -number if sign else number
+
+
+def scaled_int_to_decimal(value: int, places: int) -> Decimal:
+    """
+    Exact value / 10 ** places with places decimal places
+    """
+    return Decimal(f"{value}E-{places}")
@@ -0,0 +1,31 @@
+INT64_MIN = -(2**63)
+INT64_MAX = 2**63 - 1
+
+
+def get_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("NumPy required. Install ttoolly as ttoolly[numpy]")
+    return numpy
+
+
+def get_generator(seed=None):
+    return get_numpy().random.default_rng(seed)
+
+
+def get_random_integers(
+    generator, first: int, steps: int, step: int, count: int
+) -> list[int] | None:
+    """
+    count random values first + k * step where 0 <= k <= steps, as python ints.
+    None if values do not fit int64, they should be generated without NumPy
+    """
+    if steps < 0 or not INT64_MIN <= first <= first + steps * step <= INT64_MAX:
+        return None
+    np = get_numpy()
+    offsets = generator.integers(0, steps, size=count, endpoint=True, dtype=np.uint64)
+    # offsets are less than 2 ** 64, wraparound of uint64 gives exact int64 result
+    offsets *= np.uint64(step)
+    offsets += np.uint64(first % 2**64)
+    return offsets.view(np.int64).tolist()